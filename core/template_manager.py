@@ -5,9 +5,32 @@
 import os
 import json
 from datetime import datetime
-from typing import List, Optional, Dict
+from typing import List, Optional, Dict, TextIO
 from utils.logger import logger, log_exception
 
+# orjson 可选：可用时用于模板文件的序列化和解析
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
+
+
+def _dump_json(data: dict, stream: TextIO):
+    """将模板数据以缩进JSON格式写入文本流"""
+    if ORJSON_AVAILABLE:
+        stream.write(orjson.dumps(data, option=orjson.OPT_INDENT_2).decode('utf-8'))
+    else:
+        json.dump(data, stream, ensure_ascii=False, indent=2)
+
+
+def _load_json(stream: TextIO) -> dict:
+    """从文本流解析模板数据"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(stream.read())
+    return json.load(stream)
+
 
 class Template:
     """水印配置模板"""
@@ -87,7 +110,7 @@ class TemplateManager:
             filepath = os.path.join(self.template_dir, filename)
             
             with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(template.to_dict(), f, ensure_ascii=False, indent=2)
+                _dump_json(template.to_dict(), f)
             
             logger.info(f"模板保存成功: {template.name} -> {filepath}")
             return True
@@ -101,7 +124,7 @@ class TemplateManager:
         """从文件加载单个模板"""
         try:
             with open(filepath, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+                data = _load_json(f)
             
             template = Template.from_dict(data)
             logger.debug(f"加载模板: {template.name} from {filepath}")
@@ -190,13 +213,13 @@ class TemplateManager:
     @log_exception
     def export_template(self, name: str, export_path: str) -> bool:
         """导出模板到指定路径"""
-        template = self.get_template(name)
-        if not template:
+        if not self.get_template(name):
             return False
         
         try:
             with open(export_path, 'w', encoding='utf-8') as f:
-                json.dump(template.to_dict(), f, ensure_ascii=False, indent=2)
+                if not self.export_template_to_stream(name, f):
+                    return False
             
             logger.info(f"导出模板: {name} -> {export_path}")
             return True
@@ -205,22 +228,54 @@ class TemplateManager:
             logger.error(f"导出模板失败: {e}")
             return False
     
+    @log_exception
+    def export_template_to_stream(self, name: str, stream: TextIO) -> bool:
+        """导出模板到文本流"""
+        template = self.get_template(name)
+        if not template:
+            return False
+        
+        try:
+            _dump_json(template.to_dict(), stream)
+            return True
+            
+        except Exception as e:
+            logger.error(f"导出模板失败: {e}")
+            return False
+    
     @log_exception
     def import_template(self, import_path: str) -> Optional[Template]:
         """从文件导入模板"""
         template = self.load_template(import_path)
         if template:
-            # 确保模板名称唯一
-            original_name = template.name
-            counter = 1
-            while self.get_template(template.name):
-                template.name = f"{original_name} ({counter})"
-                counter += 1
-            
-            template.is_default = False
-            if self.save_template(template):
-                logger.info(f"导入模板成功: {template.name}")
-                return template
+            return self._add_imported_template(template)
+        
+        return None
+    
+    @log_exception
+    def import_template_from_stream(self, stream: TextIO) -> Optional[Template]:
+        """从文本流导入模板"""
+        try:
+            template = Template.from_dict(_load_json(stream))
+        except Exception as e:
+            logger.error(f"加载模板失败: {e}")
+            return None
+        
+        return self._add_imported_template(template)
+    
+    def _add_imported_template(self, template: Template) -> Optional[Template]:
+        """以唯一名称保存导入的模板"""
+        # 确保模板名称唯一
+        original_name = template.name
+        counter = 1
+        while self.get_template(template.name):
+            template.name = f"{original_name} ({counter})"
+            counter += 1
+        
+        template.is_default = False
+        if self.save_template(template):
+            logger.info(f"导入模板成功: {template.name}")
+            return template
         
         return None
     
@@ -327,7 +382,7 @@ class TemplateManager:
             
             try:
                 with open(filepath, 'w', encoding='utf-8') as f:
-                    json.dump(template.to_dict(), f, ensure_ascii=False, indent=2)
+                    _dump_json(template.to_dict(), f)
                 logger.info(f"创建默认模板: {template.name}")
             except Exception as e:
                 logger.error(f"创建默认模板失败: {e}")
@@ -3,7 +3,8 @@
 专门处理大图片水印，优化内存使用
 """
 import os
-from typing import Optional, Tuple
+from contextlib import nullcontext
+from typing import List, Optional, Tuple, Union
 from PIL import Image, ImageDraw, ImageFont
 from models.watermark_config import WatermarkConfig, WatermarkType, WatermarkPosition
 from core.advanced_text_renderer import AdvancedTextRenderer
@@ -21,45 +22,58 @@ class WatermarkEngine:
         self.memory_conservative_mode = False
         self.ultra_conservative_mode = False  # 超保守模式，针对大文件
         self.advanced_text_renderer = AdvancedTextRenderer()  # Advanced text effects renderer
-        logger.debug(f"水印引擎参数: max_dimension={self.max_image_dimension}, max_overlay={self.max_overlay_size}")
+        logger.debug("水印引擎参数: max_dimension=%s, max_overlay=%s", self.max_image_dimension, self.max_overlay_size)
+    
+    def reset(self):
+        """清除处理大图片时启用的保守模式标志，恢复标准处理模式"""
+        self.memory_conservative_mode = False
+        self.ultra_conservative_mode = False
     
     @log_performance
-    def process_image(self, image_path: str, config: WatermarkConfig, 
+    def process_image(self, image: Union[str, Image.Image], config: WatermarkConfig, 
                      output_path: Optional[str] = None) -> Optional[str]:
         """
         处理图片添加水印
         
         Args:
-            image_path: 输入图片路径
+            image: 输入图片路径，或已在内存中的PIL图片（内存保守模式下可能被直接绘制修改）
             config: 水印配置
-            output_path: 输出路径，如果为None则覆盖原文件
+            output_path: 输出路径，如果为None则覆盖原文件（传入PIL图片时必须指定）
             
         Returns:
             处理后的图片路径，失败返回None
         """
-        logger.info(f"开始处理图片: {os.path.basename(image_path)}")
-        logger.debug(f"输入路径: {image_path}")
-        logger.debug(f"输出路径: {output_path}")
-        logger.debug(f"水印类型: {config.watermark_type}")
+        in_memory = isinstance(image, Image.Image)
+        image_path = None if in_memory else image
+        source_name = f"<内存图片 {image.size[0]}x{image.size[1]}>" if in_memory else os.path.basename(image_path)
+        
+        logger.info(f"开始处理图片: {source_name}")
+        logger.debug("输入路径: %s", image_path)
+        logger.debug("输出路径: %s", output_path)
+        logger.debug("水印类型: %s", config.watermark_type)
         
         try:
+            if in_memory:
+                if output_path is None:
+                    logger.error("处理内存图片时必须指定输出路径")
+                    return None
             # 检查文件是否存在
-            if not os.path.exists(image_path):
+            elif not os.path.exists(image_path):
                 logger.error(f"输入文件不存在: {image_path}")
                 return None
             
-            # 打开图片并检查尺寸
+            # 打开图片并检查尺寸（内存图片由调用方管理，不在此关闭）
             logger.debug("打开图片文件进行处理")
-            with Image.open(image_path) as img:
+            with (nullcontext(image) if in_memory else Image.open(image_path)) as img:
                 original_size = img.size
                 logger.info(f"图片尺寸: {original_size[0]}x{original_size[1]} 像素")
                 print(f"处理图片: {original_size[0]}x{original_size[1]} 像素")
                 
                 # 检查是否需要启用内存保守模式
                 total_pixels = original_size[0] * original_size[1]
-                file_size_mb = os.path.getsize(image_path) / (1024 * 1024)
+                file_size_mb = 0.0 if in_memory else os.path.getsize(image_path) / (1024 * 1024)
                 
-                logger.debug(f"图片信息: {total_pixels/1e6:.1f}MP, {file_size_mb:.1f}MB")
+                logger.debug("图片信息: %.1fMP, %.1fMB", total_pixels/1e6, file_size_mb)
                 
                 if total_pixels > 25 * 1024 * 1024 or file_size_mb > 5.0:  # 25MP以上或5MB以上
                     self.ultra_conservative_mode = True
@@ -99,17 +113,33 @@ class WatermarkEngine:
             print(f"水印处理失败: {e}")
             return None
     
+    @log_performance
+    def apply_many(self, img: Image.Image, configs: List[WatermarkConfig]) -> List[Optional[Image.Image]]:
+        """
+        对同一张已解码的图片分别应用多组水印配置
+        
+        Args:
+            img: 已在内存中的PIL图片，不会被修改
+            configs: 水印配置列表
+            
+        Returns:
+            与配置一一对应的处理结果图片，失败的项为None
+        """
+        logger.info(f"批量应用水印: {len(configs)} 组配置, 图片尺寸: {img.size[0]}x{img.size[1]}")
+        # 每组配置在副本上绘制，源图只需解码一次
+        return [self._apply_watermark(img.copy(), config) for config in configs]
+    
     @log_exception
     def _apply_watermark(self, img: Image.Image, config: WatermarkConfig) -> Optional[Image.Image]:
         """应用水印到图片"""
         try:
-            logger.debug(f"开始应用水印: {config.watermark_type}")
+            logger.debug("开始应用水印: %s", config.watermark_type)
             
             if config.watermark_type == WatermarkType.TEXT:
-                logger.debug(f"应用文本水印: '{config.text_config.text}'")
+                logger.debug("应用文本水印: '%s'", config.text_config.text)
                 return self._apply_text_watermark_optimized(img, config)
             elif config.watermark_type == WatermarkType.IMAGE:
-                logger.debug(f"应用图片水印: {config.image_config.image_path}")
+                logger.debug("应用图片水印: %s", config.image_config.image_path)
                 return self._apply_image_watermark_optimized(img, config)
             else:
                 logger.warning(f"未知的水印类型: {config.watermark_type}")
@@ -182,7 +212,7 @@ class WatermarkEngine:
             # Fallback to original rendering for simple text or conservative mode
             logger.info(f"导出: 使用基础文本渲染 - 粗体:{config.text_config.font_bold}, 斜体:{config.text_config.font_italic}")
             # 加载字体
-            logger.debug(f"加载字体: {config.text_config.font_family}, 大小: {config.text_config.font_size}, 粗体: {config.text_config.font_bold}, 斜体: {config.text_config.font_italic}")
+            logger.debug("加载字体: %s, 大小: %s, 粗体: %s, 斜体: %s", config.text_config.font_family, config.text_config.font_size, config.text_config.font_bold, config.text_config.font_italic)
             font = self._load_font(config.text_config.font_family, config.text_config.font_size, config.text_config.font_bold, config.text_config.font_italic)
             
             # 获取文本尺寸
@@ -390,7 +420,7 @@ class WatermarkEngine:
     
     def _load_font(self, font_family: str, font_size: int, bold: bool = False, italic: bool = False) -> ImageFont.FreeTypeFont:
         """加载字体，支持粗体和斜体 - 使用FontManager确保与预览一致"""
-        logger.debug(f"导出: 加载字体 {font_family}, 大小:{font_size}, 粗体:{bold}, 斜体:{italic}")
+        logger.debug("导出: 加载字体 %s, 大小:%s, 粗体:%s, 斜体:%s", font_family, font_size, bold, italic)
         
         # 首先尝试使用FontManager获取字体路径（与预览保持一致）
         font_path = FontManager.get_font_path(font_family, bold, italic)
@@ -508,7 +538,7 @@ class WatermarkEngine:
         for font_path in font_paths:
             try:
                 font = ImageFont.truetype(font_path, font_size)
-                logger.debug(f"导出: 成功加载字体: {font_path} (粗体:{bold}, 斜体:{italic})")
+                logger.debug("导出: 成功加载字体: %s (粗体:%s, 斜体:%s)", font_path, bold, italic)
                 return font
             except (OSError, IOError):
                 continue
@@ -22,6 +22,203 @@ from ui.main_window import MainWindow
 from utils.logger import logger, log_exception
 
 
+# Application-wide stylesheet with Chinese font support, built once at import
+APPLICATION_STYLESHEET = """
+/* Application-wide styles with beautiful Chinese font support */
+
+* {
+    font-family: "Microsoft YaHei UI", "Microsoft YaHei", "SimHei", "黑体", "Arial", sans-serif;
+}
+
+QMainWindow {
+    background-color: #f5f5f5;
+    color: #333;
+}
+
+QMenuBar {
+    background-color: #fff;
+    border-bottom: 1px solid #ddd;
+    padding: 2px;
+}
+
+QMenuBar::item {
+    background-color: transparent;
+    padding: 5px 8px;
+    border-radius: 3px;
+}
+
+QMenuBar::item:selected {
+    background-color: #e3f2fd;
+}
+
+QMenu {
+    background-color: #fff;
+    border: 1px solid #ddd;
+    border-radius: 3px;
+    padding: 3px;
+}
+
+QMenu::item {
+    padding: 5px 20px;
+    border-radius: 3px;
+}
+
+QMenu::item:selected {
+    background-color: #e3f2fd;
+}
+
+QStatusBar {
+    background-color: #fff;
+    border-top: 1px solid #ddd;
+    padding: 2px;
+}
+
+QPushButton {
+    background-color: #fff;
+    border: 1px solid #ddd;
+    border-radius: 3px;
+    padding: 5px 10px;
+    min-width: 60px;
+}
+
+QPushButton:hover {
+    background-color: #f0f0f0;
+    border-color: #bbb;
+}
+
+QPushButton:pressed {
+    background-color: #e0e0e0;
+}
+
+QPushButton:disabled {
+    background-color: #f8f8f8;
+    color: #aaa;
+    border-color: #eee;
+}
+
+QLineEdit {
+    background-color: #fff;
+    border: 1px solid #ddd;
+    border-radius: 3px;
+    padding: 5px;
+}
+
+QLineEdit:focus {
+    border-color: #2196f3;
+}
+
+QComboBox {
+    background-color: #fff;
+    border: 1px solid #ddd;
+    border-radius: 3px;
+    padding: 5px;
+}
+
+QComboBox:focus {
+    border-color: #2196f3;
+}
+
+QComboBox::drop-down {
+    border: none;
+    width: 20px;
+}
+
+QComboBox::down-arrow {
+    image: none;
+    border-left: 5px solid transparent;
+    border-right: 5px solid transparent;
+    border-top: 5px solid #666;
+}
+
+QSpinBox {
+    background-color: #fff;
+    border: 1px solid #ddd;
+    border-radius: 3px;
+    padding: 3px;
+}
+
+QSpinBox:focus {
+    border-color: #2196f3;
+}
+
+QSlider::groove:horizontal {
+    border: 1px solid #ddd;
+    height: 6px;
+    background: #f0f0f0;
+    border-radius: 3px;
+}
+
+QSlider::handle:horizontal {
+    background: #2196f3;
+    border: 1px solid #1976d2;
+    width: 16px;
+    margin: -6px 0;
+    border-radius: 8px;
+}
+
+QSlider::handle:horizontal:hover {
+    background: #1976d2;
+}
+
+QCheckBox::indicator {
+    width: 16px;
+    height: 16px;
+    border: 1px solid #ddd;
+    border-radius: 2px;
+    background-color: #fff;
+}
+
+QCheckBox::indicator:checked {
+    background-color: #2196f3;
+    border-color: #1976d2;
+}
+
+QRadioButton::indicator {
+    width: 16px;
+    height: 16px;
+    border: 1px solid #ddd;
+    border-radius: 8px;
+    background-color: #fff;
+}
+
+QRadioButton::indicator:checked {
+    background-color: #2196f3;
+    border-color: #1976d2;
+}
+
+QGroupBox {
+    font-weight: bold;
+    border: 1px solid #ddd;
+    border-radius: 5px;
+    margin-top: 10px;
+    padding-top: 5px;
+}
+
+QGroupBox::title {
+    subcontrol-origin: margin;
+    left: 10px;
+    padding: 0 5px 0 5px;
+    background-color: #f5f5f5;
+}
+
+QSplitter::handle {
+    background-color: #ddd;
+}
+
+QSplitter::handle:horizontal {
+    width: 3px;
+}
+
+QSplitter::handle:vertical {
+    height: 3px;
+}
+
+QMessageBox {
+    background-color: #fff;
+}
+"""
+
+
 class PhotoWatermarkApp(QApplication):
     """Main application class"""
     
@@ -53,6 +250,9 @@ class PhotoWatermarkApp(QApplication):
     @log_exception
     def init_main_window(self):
         """Initialize and show main window"""
+        # Report startup failures here rather than relying on sys.excepthook:
+        # launcher.py calls main() inside its own try/except, so an exception
+        # raised from here would never reach the global handler
         try:
             logger.info("创建主窗口实例")
             self.main_window = MainWindow()
@@ -71,200 +271,7 @@ class PhotoWatermarkApp(QApplication):
     
     def get_application_stylesheet(self):
         """Get application-wide stylesheet with Chinese font support"""
-        return """
-        /* Application-wide styles with beautiful Chinese font support */
-        
-        * {
-            font-family: "Microsoft YaHei UI", "Microsoft YaHei", "SimHei", "黑体", "Arial", sans-serif;
-        }
-        
-        QMainWindow {
-            background-color: #f5f5f5;
-            color: #333;
-        }
-        
-        QMenuBar {
-            background-color: #fff;
-            border-bottom: 1px solid #ddd;
-            padding: 2px;
-        }
-        
-        QMenuBar::item {
-            background-color: transparent;
-            padding: 5px 8px;
-            border-radius: 3px;
-        }
-        
-        QMenuBar::item:selected {
-            background-color: #e3f2fd;
-        }
-        
-        QMenu {
-            background-color: #fff;
-            border: 1px solid #ddd;
-            border-radius: 3px;
-            padding: 3px;
-        }
-        
-        QMenu::item {
-            padding: 5px 20px;
-            border-radius: 3px;
-        }
-        
-        QMenu::item:selected {
-            background-color: #e3f2fd;
-        }
-        
-        QStatusBar {
-            background-color: #fff;
-            border-top: 1px solid #ddd;
-            padding: 2px;
-        }
-        
-        QPushButton {
-            background-color: #fff;
-            border: 1px solid #ddd;
-            border-radius: 3px;
-            padding: 5px 10px;
-            min-width: 60px;
-        }
-        
-        QPushButton:hover {
-            background-color: #f0f0f0;
-            border-color: #bbb;
-        }
-        
-        QPushButton:pressed {
-            background-color: #e0e0e0;
-        }
-        
-        QPushButton:disabled {
-            background-color: #f8f8f8;
-            color: #aaa;
-            border-color: #eee;
-        }
-        
-        QLineEdit {
-            background-color: #fff;
-            border: 1px solid #ddd;
-            border-radius: 3px;
-            padding: 5px;
-        }
-        
-        QLineEdit:focus {
-            border-color: #2196f3;
-        }
-        
-        QComboBox {
-            background-color: #fff;
-            border: 1px solid #ddd;
-            border-radius: 3px;
-            padding: 5px;
-        }
-        
-        QComboBox:focus {
-            border-color: #2196f3;
-        }
-        
-        QComboBox::drop-down {
-            border: none;
-            width: 20px;
-        }
-        
-        QComboBox::down-arrow {
-            image: none;
-            border-left: 5px solid transparent;
-            border-right: 5px solid transparent;
-            border-top: 5px solid #666;
-        }
-        
-        QSpinBox {
-            background-color: #fff;
-            border: 1px solid #ddd;
-            border-radius: 3px;
-            padding: 3px;
-        }
-        
-        QSpinBox:focus {
-            border-color: #2196f3;
-        }
-        
-        QSlider::groove:horizontal {
-            border: 1px solid #ddd;
-            height: 6px;
-            background: #f0f0f0;
-            border-radius: 3px;
-        }
-        
-        QSlider::handle:horizontal {
-            background: #2196f3;
-            border: 1px solid #1976d2;
-            width: 16px;
-            margin: -6px 0;
-            border-radius: 8px;
-        }
-        
-        QSlider::handle:horizontal:hover {
-            background: #1976d2;
-        }
-        
-        QCheckBox::indicator {
-            width: 16px;
-            height: 16px;
-            border: 1px solid #ddd;
-            border-radius: 2px;
-            background-color: #fff;
-        }
-        
-        QCheckBox::indicator:checked {
-            background-color: #2196f3;
-            border-color: #1976d2;
-        }
-        
-        QRadioButton::indicator {
-            width: 16px;
-            height: 16px;
-            border: 1px solid #ddd;
-            border-radius: 8px;
-            background-color: #fff;
-        }
-        
-        QRadioButton::indicator:checked {
-            background-color: #2196f3;
-            border-color: #1976d2;
-        }
-        
-        QGroupBox {
-            font-weight: bold;
-            border: 1px solid #ddd;
-            border-radius: 5px;
-            margin-top: 10px;
-            padding-top: 5px;
-        }
-        
-        QGroupBox::title {
-            subcontrol-origin: margin;
-            left: 10px;
-            padding: 0 5px 0 5px;
-            background-color: #f5f5f5;
-        }
-        
-        QSplitter::handle {
-            background-color: #ddd;
-        }
-        
-        QSplitter::handle:horizontal {
-            width: 3px;
-        }
-        
-        QSplitter::handle:vertical {
-            height: 3px;
-        }
-        
-        QMessageBox {
-            background-color: #fff;
-        }
-        """
+        return APPLICATION_STYLESHEET
 
 
 @log_exception
@@ -281,11 +288,8 @@ def main():
     if hasattr(Qt, 'AA_UseHighDpiPixmaps'):
         QApplication.setAttribute(Qt.AA_UseHighDpiPixmaps, True)
     
-    # Create and run application
-    logger.info("创建应用程序实例")
-    app = PhotoWatermarkApp(sys.argv)
-    
-    # Set up exception handling
+    # Set up exception handling before the application is constructed so
+    # that errors raised while it is being set up are reported too
     def handle_exception(exc_type, exc_value, exc_traceback):
         if issubclass(exc_type, KeyboardInterrupt):
             sys.__excepthook__(exc_type, exc_value, exc_traceback)
@@ -295,17 +299,22 @@ def main():
         error_msg = ''.join(traceback.format_exception(exc_type, exc_value, exc_traceback))
         logger.error(f"未捕获异常: {error_msg}")
         
-        QMessageBox.critical(
-            None,
-            "程序错误",
-            f"程序遇到未处理的错误：\n\n{str(exc_value)}\n\n程序将退出。",
-            QMessageBox.Ok
-        )
+        if QApplication.instance() is not None:
+            QMessageBox.critical(
+                None,
+                "程序错误",
+                f"程序遇到未处理的错误：\n\n{str(exc_value)}\n\n程序将退出。",
+                QMessageBox.Ok
+            )
         sys.exit(1)
     
     logger.debug("设置全局异常处理器")
     sys.excepthook = handle_exception
     
+    # Create and run application
+    logger.info("创建应用程序实例")
+    app = PhotoWatermarkApp(sys.argv)
+    
     # Run the application
     try:
         logger.info("启动应用程序主循环")
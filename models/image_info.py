@@ -3,8 +3,9 @@ Image Information Model
 Stores metadata and state information for loaded images
 """
 import os
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import Optional
+from typing import Iterator, Optional
 from PIL import Image
 
 # Conditional import for Qt components
@@ -21,6 +22,10 @@ except ImportError:
         return lambda: None
 
 
+# Image modes that carry an alpha channel
+_ALPHA_MODES = frozenset({'RGBA', 'LA', 'PA', 'RGBa', 'La'})
+
+
 @dataclass
 class ImageInfo:
     """Data class for storing image information"""
@@ -49,7 +54,8 @@ class ImageInfo:
             with Image.open(file_path) as img:
                 image_size = img.size
                 format = img.format
-                has_alpha = img.mode in ('RGBA', 'LA') or 'transparency' in img.info
+                # Palette/RGB/L images may still carry a tRNS transparency entry
+                has_alpha = img.mode in _ALPHA_MODES or 'transparency' in img.info
                 
             return cls(
                 file_path=file_path,
@@ -102,25 +108,34 @@ class ImageListModel(QObject):
         return False
     
     def add_images(self, file_paths: list) -> int:
-        """Add multiple images with batch processing, return count of successfully added"""
-        added_count = 0
-        batch_size = 50  # Process in batches to avoid memory issues
+        """Add multiple images, return count of successfully added
         
-        for i in range(0, len(file_paths), batch_size):
-            batch = file_paths[i:i + batch_size]
-            for file_path in batch:
-                try:
-                    if self.add_image(file_path):
-                        added_count += 1
-                except Exception as e:
-                    print(f"Error adding image {file_path}: {e}")
-                    continue
-            
-            # Emit progress update after each batch
-            if added_count > 0:
-                self.images_changed.emit()
+        Image headers are probed in parallel and the new entries are appended
+        in one step, so images_changed is emitted at most once per call.
+        """
+        existing = {img.file_path for img in self._images}
+        new_paths = []
+        for file_path in file_paths:
+            if file_path not in existing:
+                existing.add(file_path)
+                new_paths.append(file_path)
+        
+        if not new_paths:
+            return 0
+        
+        if len(new_paths) == 1:
+            infos = [ImageInfo.from_file(new_paths[0])]
+        else:
+            max_workers = min(len(new_paths), os.cpu_count() or 1)
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                infos = list(executor.map(ImageInfo.from_file, new_paths))
         
-        return added_count
+        added = [info for info in infos if info]
+        if added:
+            self._images.extend(added)
+            self.images_changed.emit()
+        
+        return len(added)
     
     def remove_image(self, index: int) -> bool:
         """Remove image at index"""
@@ -154,23 +169,19 @@ class ImageListModel(QObject):
     
     def select_all(self):
         """Select all images"""
-        changed = False
-        for img in self._images:
-            if not img.is_selected:
-                img.is_selected = True
-                changed = True
-        if changed:
-            self.selection_changed.emit()
+        self._set_all_selected(True)
     
     def clear_selection(self):
         """Clear all selections"""
-        changed = False
+        self._set_all_selected(False)
+    
+    def _set_all_selected(self, selected: bool):
+        """Set every image to the same selection state, emitting once if anything changed"""
+        if all(img.is_selected == selected for img in self._images):
+            return
         for img in self._images:
-            if img.is_selected:
-                img.is_selected = False
-                changed = True
-        if changed:
-            self.selection_changed.emit()
+            img.is_selected = selected
+        self.selection_changed.emit()
     
     def get_image(self, index: int) -> Optional[ImageInfo]:
         """Get image info at index"""
@@ -179,9 +190,13 @@ class ImageListModel(QObject):
         return None
     
     def get_images(self) -> list:
-        """Get all images"""
+        """Get a snapshot copy of all images"""
         return self._images.copy()
     
+    def iter_images(self) -> Iterator[ImageInfo]:
+        """Iterate over all images without copying the list (read-only use)"""
+        return iter(self._images)
+    
     def get_all_images(self) -> list:
         """Get all images (alias for get_images)"""
         return self.get_images()
@@ -47,10 +47,13 @@ class WatermarkPosition(Enum):
     CUSTOM = "custom"
 
 
+# Value → member lookup tables used when deserializing configs
+_WATERMARK_TYPES = {member.value: member for member in WatermarkType}
+_WATERMARK_POSITIONS = {member.value: member for member in WatermarkPosition}
 
 
 
-@dataclass
+@dataclass(slots=True)
 class TextWatermarkConfig:
     """Configuration for text watermarks with advanced effects"""
     # Basic text properties
@@ -75,7 +78,7 @@ class TextWatermarkConfig:
     outline_opacity: float = 1.0
 
 
-@dataclass
+@dataclass(slots=True)
 class ImageWatermarkConfig:
     """Configuration for image watermarks"""
     image_path: str = ""
@@ -84,7 +87,7 @@ class ImageWatermarkConfig:
     maintain_aspect_ratio: bool = True
     
 
-@dataclass
+@dataclass(slots=True)
 class WatermarkConfig:
     """Complete watermark configuration"""
     # Type and position
@@ -148,8 +151,8 @@ class WatermarkConfig:
         logger.debug(f"从字典创建水印配置: {len(data)} 个参数")
         config = cls()
         
-        config.watermark_type = WatermarkType(data.get('watermark_type', 'text'))
-        config.position = WatermarkPosition(data.get('position', 'bottom_right'))
+        config.watermark_type = _WATERMARK_TYPES.get(data.get('watermark_type'), WatermarkType.TEXT)
+        config.position = _WATERMARK_POSITIONS.get(data.get('position'), WatermarkPosition.BOTTOM_RIGHT)
         config.custom_x = data.get('custom_x', 0)
         config.custom_y = data.get('custom_y', 0)
         config.margin_x = data.get('margin_x', 10)
@@ -164,15 +167,15 @@ class WatermarkConfig:
             font_size=text_data.get('font_size', 32),
             font_bold=text_data.get('font_bold', False),
             font_italic=text_data.get('font_italic', False),
-            color=tuple(text_data.get('color', [255, 255, 255])),
+            color=tuple(text_data['color']) if 'color' in text_data else (255, 255, 255),
             opacity=text_data.get('opacity', 0.8),
             has_shadow=text_data.get('has_shadow', False),
-            shadow_offset=tuple(text_data.get('shadow_offset', [2, 2])),
-            shadow_color=tuple(text_data.get('shadow_color', [0, 0, 0])),
+            shadow_offset=tuple(text_data['shadow_offset']) if 'shadow_offset' in text_data else (2, 2),
+            shadow_color=tuple(text_data['shadow_color']) if 'shadow_color' in text_data else (0, 0, 0),
             shadow_opacity=text_data.get('shadow_opacity', 0.6),
             has_outline=text_data.get('has_outline', False),
             outline_width=text_data.get('outline_width', 1),
-            outline_color=tuple(text_data.get('outline_color', [0, 0, 0])),
+            outline_color=tuple(text_data['outline_color']) if 'outline_color' in text_data else (0, 0, 0),
             outline_opacity=text_data.get('outline_opacity', 1.0),
         )
         
@@ -0,0 +1,101 @@
+"""
+测试共享夹具
+在整个测试会话中复用的测试资源
+"""
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+# 统一将项目根目录加入导入路径，测试模块无需各自修改 sys.path
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from tests.image_cache import cached_image_path
+
+# Linux 上把 pytest 的临时目录（tmp_path 等）放到内存文件系统，测试输出不落盘
+if sys.platform.startswith("linux") and os.access("/dev/shm", os.W_OK):
+    os.environ.setdefault("PYTEST_DEBUG_TEMPROOT", "/dev/shm")
+
+# GUI 测试默认使用 offscreen 平台插件，无显示器的 CI 上也能运行；需要观察窗口时设置 WATERMARK_TEST_VISUAL=1
+if os.environ.get("WATERMARK_TEST_VISUAL") != "1":
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+
+def pytest_addoption(parser):
+    parser.addoption("--slow", action="store_true", default=False,
+                     help="运行标记为 slow 的测试（如构建完整主窗口）")
+
+
+def pytest_collection_modifyitems(config, items):
+    """未指定 --slow 时跳过标记为 slow 的测试"""
+    if config.getoption("--slow"):
+        return
+    skip_slow = pytest.mark.skip(reason="需要 --slow 才运行")
+    for item in items:
+        if "slow" in item.keywords:
+            item.add_marker(skip_slow)
+
+
+@pytest.fixture(scope="session")
+def qapp():
+    """整个测试会话共享的 QApplication 实例，避免每个测试重复初始化 Qt；未安装 PyQt5 时跳过依赖它的测试"""
+    QtWidgets = pytest.importorskip("PyQt5.QtWidgets")
+    QApplication = QtWidgets.QApplication
+    app = QApplication.instance() or QApplication([])
+    yield app
+
+
+@pytest.fixture(scope="session")
+def main_window(qapp):
+    """整个测试会话共享的主窗口实例（不显示），避免每个测试重复构建界面"""
+    from ui.main_window import MainWindow
+    window = MainWindow()
+    yield window
+    # close() 会弹出退出确认对话框，测试结束时直接释放窗口
+    window.deleteLater()
+
+
+@pytest.fixture(scope="session")
+def _session_engine():
+    """整个测试会话共享的水印引擎实例"""
+    from core.watermark_engine import WatermarkEngine
+    return WatermarkEngine()
+
+
+@pytest.fixture
+def engine(_session_engine):
+    """共享的水印引擎；处理大图后会保留保守模式标志，因此每个测试结束后复位"""
+    yield _session_engine
+    _session_engine.reset()
+
+
+@pytest.fixture(scope="session")
+def cached_image():
+    """返回按内容参数缓存的测试图片路径，每种图片只编码一次
+
+    图片缓存在系统临时目录中并跨测试运行复用，测试不应修改或删除它们。
+    参数见 tests.image_cache.cached_image_path。
+    """
+    return cached_image_path
+
+
+@pytest.fixture(scope="session")
+def red_jpg(cached_image):
+    """100x100 红色 JPEG 测试图片"""
+    return cached_image((100, 100), (255, 0, 0), 'JPEG')
+
+
+@pytest.fixture(scope="session")
+def sample_jpeg(cached_image):
+    """500x400 纯色 JPEG 测试图片，水印引擎相关测试共用"""
+    return cached_image((500, 400), (100, 150, 200), 'JPEG')
+
+
+@pytest.fixture(scope="session")
+def sample_image():
+    """与 sample_jpeg 同色同尺寸的内存 RGB 图片，整个会话只构建一次；交给引擎绘制前应先 copy()"""
+    from PIL import Image
+    return Image.new('RGB', (500, 400), (100, 150, 200))
@@ -0,0 +1,90 @@
+"""
+测试图片磁盘缓存
+按内容参数生成的测试图片只编码一次，并在多次测试运行之间复用
+"""
+import hashlib
+import os
+import shutil
+import tempfile
+from functools import lru_cache
+from pathlib import Path
+
+from PIL import Image, ImageDraw, ImageFont
+
+# 缓存目录位于系统临时目录，跨测试运行保留
+FIXTURE_DIR = Path(tempfile.gettempdir()) / "photowater_fixtures"
+
+
+@lru_cache(maxsize=None)
+def _label_font(font_size):
+    """标注文字使用的字体，每种字号只加载一次"""
+    try:
+        return ImageFont.truetype("arial.ttf", font_size)
+    except OSError:
+        return ImageFont.load_default()
+
+
+def cached_image_path(size=(100, 100), color=(255, 0, 0), fmt='JPEG',
+                      quality=None, shapes=(), text=None, text_pos=(20, 20),
+                      font_size=20):
+    """返回按内容参数缓存的测试图片路径，不存在时生成
+
+    Args:
+        size: 图片尺寸 (宽, 高)
+        color: 背景颜色
+        fmt: 保存格式
+        quality: JPEG 质量，None 表示使用 PIL 默认值
+        shapes: 附加图形，元素为 ('rectangle' | 'ellipse', 坐标, 填充色)
+        text: 白色标注文字
+        text_pos: 标注文字位置
+        font_size: 标注文字字号
+
+    缓存文件由所有测试共享，调用方不应修改或删除它们。
+    """
+    size = tuple(size)
+    color = tuple(color)
+    shapes = tuple((kind, tuple(box), tuple(fill)) for kind, box, fill in shapes)
+    text_pos = tuple(text_pos)
+    key = hashlib.md5(repr((size, color, fmt, quality, shapes,
+                            text, text_pos, font_size)).encode()).hexdigest()
+    ext = 'jpg' if fmt == 'JPEG' else fmt.lower()
+    path = FIXTURE_DIR / f"{key}.{ext}"
+    if path.exists():
+        return str(path)
+
+    img = Image.new('RGB', size, color)
+    if shapes or text:
+        draw = ImageDraw.Draw(img)
+        for kind, box, fill in shapes:
+            getattr(draw, kind)(list(box), fill=fill)
+        if text:
+            draw.text(text_pos, text, fill=(255, 255, 255), font=_label_font(font_size))
+
+    save_kwargs = {}
+    if fmt == 'JPEG':
+        # 测试图片：4:2:0采样、单遍基线编码即可
+        save_kwargs = dict(subsampling=2, optimize=False, progressive=False)
+        if quality is not None:
+            save_kwargs['quality'] = quality
+
+    # 先写入临时文件再原子替换，避免并发运行读到半成品
+    FIXTURE_DIR.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(suffix=f".{ext}", dir=FIXTURE_DIR)
+    os.close(fd)
+    try:
+        img.save(tmp_name, fmt, **save_kwargs)
+        os.replace(tmp_name, path)
+    except BaseException:
+        if os.path.exists(tmp_name):
+            os.unlink(tmp_name)
+        raise
+    return str(path)
+
+
+def link_cached_image(source, dest):
+    """将缓存图片链接到目标路径，不支持符号链接时退回复制"""
+    try:
+        os.symlink(source, dest)
+    except (OSError, NotImplementedError):
+        shutil.copyfile(source, dest)
+    return str(dest)
@@ -3,52 +3,40 @@
 应用程序启动测试 - 自动退出版本
 """
 import sys
-import os
-from PyQt5.QtWidgets import QApplication
-from PyQt5.QtCore import QTimer
-
-# 添加项目根目录到路径
-project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-sys.path.insert(0, project_root)
+import pytest
 
 from utils.logger import logger
-from ui.main_window import MainWindow
 
-def test_app_startup():
+@pytest.mark.slow
+def test_app_startup(qapp, main_window):
     """测试应用程序启动和日志记录"""
     logger.info("=" * 60)
     logger.info("应用程序启动日志测试")
     logger.info("=" * 60)
     
-    # 创建QApplication
-    app = QApplication(sys.argv)
+    app = qapp
     
     try:
-        # 创建主窗口
-        logger.info("创建应用程序主窗口...")
-        main_window = MainWindow()
+        # 显示主窗口（由会话夹具创建）
+        logger.info("显示应用程序主窗口...")
         main_window.show()
         
         logger.info("应用程序主窗口已显示")
         logger.info("所有组件初始化完成")
         
-        # 设置3秒后自动退出
-        def auto_exit():
-            logger.info("测试完成，3秒后自动退出")
-            logger.info("=" * 60)
-            logger.info("应用程序启动日志测试完成")
-            logger.info("=" * 60)
-            app.quit()
+        # 处理挂起的事件，让初始化信号同步触发，无需等待计时器
+        for _ in range(5):
+            app.processEvents()
         
-        timer = QTimer()
-        timer.timeout.connect(auto_exit)
-        timer.start(3000)  # 3秒
+        logger.info("测试完成，事件处理完毕")
+        logger.info("=" * 60)
+        logger.info("应用程序启动日志测试完成")
+        logger.info("=" * 60)
         
-        print("✅ 应用程序启动成功，正在记录日志...")
-        print("⏱️  3秒后自动退出...")
+        print("✅ 应用程序启动成功，日志已记录")
         
-        # 运行应用
-        app.exec_()
+        # close() 会弹出退出确认对话框，这里只隐藏窗口，由夹具负责释放
+        main_window.hide()
         
         return True
         
@@ -58,5 +46,6 @@ def test_app_startup():
         return False
 
 if __name__ == "__main__":
-    success = test_app_startup()
-    print("\n日志已记录到 logs/ 目录")
\ No newline at end of file
+    exit_code = pytest.main([__file__])
+    print("\n日志已记录到 logs/ 目录")
+    sys.exit(exit_code)
\ No newline at end of file
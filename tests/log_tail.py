@@ -0,0 +1,43 @@
+"""
+日志尾部读取工具
+只读取文件末尾所需的字节，避免为取最后几行而读入整个日志文件
+"""
+import os
+from typing import List, Optional, Tuple
+
+
+def tail(path: str, n: int, block_size: int = 4096) -> List[str]:
+    """返回文件最后 n 行（不含换行符），从文件末尾按块向前读取"""
+    if n <= 0:
+        return []
+    
+    with open(path, 'rb') as f:
+        f.seek(0, os.SEEK_END)
+        position = f.tell()
+        data = b''
+        
+        # 读到 n+1 个换行符即可保证最后 n 行完整
+        while position > 0 and data.count(b'\n') <= n:
+            read_size = min(block_size, position)
+            position -= read_size
+            f.seek(position)
+            data = f.read(read_size) + data
+    
+    return [line.decode('utf-8', errors='replace') for line in data.splitlines()[-n:]]
+
+
+def latest_log(log_dir: str, suffix: str = '.log') -> Optional[Tuple[str, int]]:
+    """返回目录中最近修改的日志文件路径及其大小，目录或日志文件不存在时返回 None"""
+    try:
+        # os.scandir 一次遍历即可拿到文件信息，DirEntry.stat() 的结果会被缓存
+        with os.scandir(log_dir) as it:
+            entries = [(entry.path, entry.stat()) for entry in it
+                       if entry.name.endswith(suffix) and entry.is_file()]
+    except FileNotFoundError:
+        return None
+    
+    if not entries:
+        return None
+    
+    path, stat = max(entries, key=lambda entry: entry[1].st_mtime)
+    return path, stat.st_size
@@ -4,16 +4,14 @@
 """
 import sys
 import os
-from PIL import Image, ImageDraw
+import numpy as np
+from PIL import Image
 
-# 添加项目路径
-sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 def create_test_image():
     """创建一个包含已知颜色的测试图像"""
-    # 创建一个 200x200 的测试图像
-    img = Image.new('RGB', (200, 200), (255, 255, 255))
-    draw = ImageDraw.Draw(img)
+    # 创建一个 200x200 的白色测试图像
+    pixels = np.full((200, 200, 3), 255, dtype=np.uint8)
     
     # 绘制一些已知颜色的区域
     colors = [
@@ -27,28 +25,22 @@ def create_test_image():
         ((0, 0, 0), "黑色"),        # 黑色
     ]
     
-    # 绘制颜色块
+    # 填充颜色块
     block_size = 50
     for i, (color, name) in enumerate(colors):
         x = (i % 4) * block_size
         y = (i // 4) * block_size
-        draw.rectangle([x, y, x + block_size, y + block_size], fill=color)
+        pixels[y:y + block_size, x:x + block_size] = color
     
-    return img
+    return Image.fromarray(pixels)
 
-def test_color_conversion():
+def test_color_conversion(qapp):
     """测试颜色转换的准确性"""
     print("测试颜色转换准确性...")
     
     try:
-        from PyQt5.QtWidgets import QApplication
         from ui.widgets.preview_widget import PreviewGraphicsView
         
-        # 创建应用程序实例
-        app = QApplication.instance()
-        if app is None:
-            app = QApplication(sys.argv)
-        
         # 创建预览组件
         preview = PreviewGraphicsView()
         
@@ -71,19 +63,13 @@ def test_color_conversion():
             print("✗ PIL 到 QPixmap 转换失败")
             return False
         
-        # 测试不同格式
-        formats_to_test = ['RGB', 'RGBA', 'L', 'P']
-        for format_name in formats_to_test:
+        # 测试不同格式（每种格式只转换一次）
+        format_images = {
+            format_name: test_img if format_name == 'RGB' else test_img.convert(format_name)
+            for format_name in ('RGB', 'RGBA', 'L', 'P')
+        }
+        for format_name, test_format_img in format_images.items():
             try:
-                if format_name == 'RGBA':
-                    test_format_img = test_img.convert('RGBA')
-                elif format_name == 'L':
-                    test_format_img = test_img.convert('L')
-                elif format_name == 'P':
-                    test_format_img = test_img.convert('P')
-                else:
-                    test_format_img = test_img
-                
                 format_pixmap = preview.pil_to_qpixmap(test_format_img)
                 if not format_pixmap.isNull():
                     print(f"✓ {format_name} 格式转换成功")
@@ -100,19 +86,14 @@ def test_color_conversion():
         print(f"✗ 颜色转换测试失败: {e}")
         return False
 
-def test_watermark_color_integrity():
+def test_watermark_color_integrity(qapp):
     """测试水印应用后的颜色完整性"""
     print("\n测试水印颜色完整性...")
     
     try:
-        from PyQt5.QtWidgets import QApplication
         from ui.widgets.preview_widget import PreviewGraphicsView
         from models.watermark_config import WatermarkConfig, WatermarkType
         
-        app = QApplication.instance()
-        if app is None:
-            app = QApplication(sys.argv)
-        
         preview = PreviewGraphicsView()
         
         # 创建测试图像
@@ -154,12 +135,15 @@ def main():
         test_watermark_color_integrity
     ]
     
+    from PyQt5.QtWidgets import QApplication
+    app = QApplication.instance() or QApplication(sys.argv)
+    
     passed = 0
     total = len(tests)
     
     for test in tests:
         try:
-            if test():
+            if test(app):
                 passed += 1
         except Exception as e:
             print(f"✗ 测试异常: {e}")
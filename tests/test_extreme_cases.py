@@ -5,11 +5,16 @@
 import sys
 import os
 import tempfile
-from PIL import Image
+import random
+from PIL import Image, ImageDraw
 import time
 
-# 添加项目路径
-sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+# NumPy 可选：不可用时退回到纯 PIL 的色块绘制
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 
 def create_extreme_test_cases():
     """创建多个极限测试用例"""
@@ -38,34 +43,53 @@ def create_extreme_test_cases():
 
 def create_test_image(size, quality, seed=None):
     """创建指定尺寸和质量的测试图片"""
-    if seed:
-        import random
-        random.seed(seed)
-    
     print(f"创建 {size[0]}x{size[1]} 像素测试图片...")
     
-    # 创建更复杂的图像内容
-    img = Image.new('RGB', size)
     width, height = size
+    block_size = 50
     
-    # 快速填充算法以节省时间
-    import random
-    for y in range(0, height, 50):  # 每50行处理
-        if y % 500 == 0:
-            print(f"  进度: {y/height*100:.0f}%")
-        
-        for x in range(0, width, 50):  # 每50列处理
-            # 创建50x50的色块
-            r = random.randint(50, 200)
-            g = random.randint(50, 200) 
-            b = random.randint(50, 200)
-            
-            # 填充50x50区域
-            for dy in range(min(50, height - y)):
-                for dx in range(min(50, width - x)):
-                    img.putpixel((x + dx, y + dy), (r, g, b))
+    if np is None:
+        # 每个50x50色块一次 rectangle 调用填充
+        rand = random.Random(seed)
+        img = Image.new('RGB', size)
+        draw = ImageDraw.Draw(img)
+        for y in range(0, height, block_size):
+            for x in range(0, width, block_size):
+                color = (rand.randint(50, 200), rand.randint(50, 200), rand.randint(50, 200))
+                draw.rectangle([x, y, x + block_size - 1, y + block_size - 1], fill=color)
+        return img
+    
+    # 每个50x50色块取一个随机颜色，再整体放大到目标尺寸
+    rng = np.random.default_rng(seed)
+    tiles = rng.integers(
+        50, 201,
+        size=(height // block_size + 1, width // block_size + 1, 3),
+        dtype=np.uint8
+    )
+    # 按行列索引一次性取出目标尺寸的连续数组，不生成放大后再裁剪的中间副本
+    rows = np.arange(height) // block_size
+    cols = np.arange(width) // block_size
+    pixels = tiles[rows[:, None], cols[None, :]]
     
-    return img
+    return Image.fromarray(pixels)
+
+def prepare_test_file(test_case):
+    """创建测试图片并保存为临时JPEG文件，返回 (文件路径, 创建耗时)"""
+    temp_file = tempfile.NamedTemporaryFile(suffix='.jpg', delete=False)
+    temp_file.close()
+    
+    try:
+        start_time = time.time()
+        test_img = create_test_image(test_case['size'], test_case['quality'], seed=42)
+        creation_time = time.time() - start_time
+        
+        # 合成图片没有有意义的色度细节：固定4:2:0采样、单遍基线编码以加快编码
+        test_img.save(temp_file.name, 'JPEG', quality=test_case['quality'],
+                      subsampling=2, optimize=False, progressive=False)
+        return temp_file.name, creation_time
+    except BaseException:
+        os.unlink(temp_file.name)
+        raise
 
 def test_extreme_case(test_case):
     """测试单个极限用例"""
@@ -73,19 +97,13 @@ def test_extreme_case(test_case):
     print(f"描述: {test_case['description']}")
     print("-" * 50)
     
-    temp_file = tempfile.NamedTemporaryFile(suffix='.jpg', delete=False)
+    image_path = None
     
     try:
-        # 创建测试图片
-        start_time = time.time()
-        test_img = create_test_image(test_case['size'], test_case['quality'], seed=42)
-        creation_time = time.time() - start_time
+        # 创建并保存测试图片
+        image_path, creation_time = prepare_test_file(test_case)
         
-        # 保存图片
-        test_img.save(temp_file.name, 'JPEG', quality=test_case['quality'])
-        temp_file.close()
-        
-        file_size = os.path.getsize(temp_file.name) / (1024 * 1024)
+        file_size = os.path.getsize(image_path) / (1024 * 1024)
         total_pixels = test_case['size'][0] * test_case['size'][1]
         
         print(f"✓ 图片创建完成 ({creation_time:.1f}s)")
@@ -104,12 +122,12 @@ def test_extreme_case(test_case):
         
         # 处理水印
         start_time = time.time()
-        output_path = temp_file.name.replace('.jpg', '_watermarked.jpg')
+        output_path = image_path.replace('.jpg', '_watermarked.jpg')
         
-        result_path = engine.process_image(temp_file.name, config, output_path)
+        result_path = engine.process_image(image_path, config, output_path)
         processing_time = time.time() - start_time
         
-        if result_path and os.path.exists(result_path):
+        if result_path:  # process_image 仅在保存成功后返回路径
             output_size = os.path.getsize(result_path) / (1024 * 1024)
             print(f"✅ 水印处理成功 ({processing_time:.1f}s)")
             print(f"  输出大小: {output_size:.1f} MB")
@@ -137,10 +155,11 @@ def test_extreme_case(test_case):
         return False
     finally:
         # 清理临时文件
-        try:
-            os.unlink(temp_file.name)
-        except:
-            pass
+        if image_path:
+            try:
+                os.unlink(image_path)
+            except:
+                pass
 
 def main():
     """主函数"""
@@ -151,6 +170,7 @@ def main():
     passed = 0
     total = len(test_cases)
     
+    # 逐个同步生成测试文件，避免同时持有两个超大用例而抬高内存峰值
     for i, test_case in enumerate(test_cases, 1):
         print(f"\n[测试 {i}/{total}]")
         try:
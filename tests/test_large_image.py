@@ -7,23 +7,70 @@ import os
 import tempfile
 from PIL import Image
 
-# 添加项目路径
-sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+# NumPy 可选：不可用时退回到逐像素生成
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
-def create_realistic_large_image(size=(7000, 4000), target_file_size_mb=6.6):
-    """创建接近真实情况的大尺寸测试图片"""
+# 向量化生成时每个条带的行数
+STRIP_ROWS = 256
+
+def create_realistic_large_image(size=(7000, 4000), target_file_size_mb=6.6, seed=None):
+    """创建接近真实情况的大尺寸测试图片（相同 seed 生成相同图片）"""
     print(f"创建 {size[0]}x{size[1]} 像素的高质量测试图片 (目标: ~{target_file_size_mb}MB)...")
     
+    width, height = size
+    
+    print("生成复杂图像内容...")
+    
+    if np is None:
+        return _create_realistic_large_image_slow(size, seed)
+    
+    # 按行/列计算三角函数，再通过广播得到每个条带的颜色分布
+    x = np.arange(width, dtype=np.float32)
+    rng = np.random.default_rng(seed)
+    channels = [
+        (100, np.sin(x / 500.0), 300.0),
+        (80, np.sin(x / 700.0 + 1), 400.0),
+        (60, np.sin(x / 600.0 + 2), 350.0),
+    ]
+    detail_x = np.sin(x / 50.0)
+    
+    # 按条带生成，临时数组只占 STRIP_ROWS 行，不随整幅图片增长
+    pixels = np.empty((height, width, 3), dtype=np.uint8)
+    for top in range(0, height, STRIP_ROWS):
+        y = np.arange(top, min(top + STRIP_ROWS, height), dtype=np.float32)
+        
+        # 添加一些细节纹理
+        detail = (20 * np.outer(np.sin(y / 50.0), detail_x)).astype(np.int16)
+        
+        # 整个条带三个通道的噪声一次生成
+        noise = rng.integers(-30, 31, size=(len(y), width, 3), dtype=np.int16)
+        
+        # 基于位置的颜色变化 + 噪声 + 细节纹理
+        for c, (amplitude, sin_x, y_period) in enumerate(channels):
+            strip = (128 + amplitude * np.outer(np.cos(y / y_period), sin_x)).astype(np.int16)
+            strip += noise[:, :, c]
+            strip += detail
+            np.clip(strip, 0, 255, out=strip)
+            pixels[top:top + len(y), :, c] = strip
+    
+    print("图像生成完成")
+    return Image.fromarray(pixels, 'RGB')
+
+def _create_realistic_large_image_slow(size, seed=None):
+    """逐像素生成测试图片（NumPy 不可用时使用）"""
     import random
     import math
     
+    rand = random.Random(seed)
+    
     # 创建基础图片
     img = Image.new('RGB', size)
     pixels = img.load()
     width, height = size
     
-    print("生成复杂图像内容...")
-    
     # 创建更复杂的图像内容以增加文件大小和内存占用
     for y in range(height):
         if y % 200 == 0:
@@ -32,9 +79,9 @@ def create_realistic_large_image(size=(7000, 4000), target_file_size_mb=6.6):
         for x in range(width):
             # 创建复杂的颜色模式
             # 添加噪声和纹理以模拟真实照片
-            noise_r = random.randint(-30, 30)
-            noise_g = random.randint(-30, 30)
-            noise_b = random.randint(-30, 30)
+            noise_r = rand.randint(-30, 30)
+            noise_g = rand.randint(-30, 30)
+            noise_b = rand.randint(-30, 30)
             
             # 基于位置的颜色变化
             base_r = int(128 + 100 * math.sin(x / 500.0) * math.cos(y / 300.0))
@@ -63,60 +110,64 @@ def test_large_image_watermark():
     
     try:
         # 创建7000x4000的大图片（模拟6.6MB真实照片）
-        large_img = create_realistic_large_image((7000, 4000), 6.6)
+        large_img = create_realistic_large_image((7000, 4000), 6.6, seed=0)
         
         # 使用较高质量保存以达到目标文件大小
         large_img.save(temp_file.name, 'JPEG', quality=95, optimize=False)
         temp_file.close()
         
+        # 生成的图片已写入文件，后续只从文件解码：释放内存并归还PIL的内存块缓存
+        del large_img
+        Image.core.clear_cache()
+        
         print(f"✓ 大图片已保存: {temp_file.name}")
         print(f"文件大小: {os.path.getsize(temp_file.name) / (1024*1024):.1f} MB")
         
         # 测试直接处理原始尺寸（跳过预览缩放）
         print("\n测试原始尺寸水印处理（跳过预览限制）...")
         
-        # 直接处理大图片
+        # 只读取文件头获取尺寸，不解码像素
         with Image.open(temp_file.name) as original_img:
             print(f"原始图片尺寸: {original_img.size}")
+        
+        # 使用新的水印引擎（不需要QApplication）
+        from core.watermark_engine import WatermarkEngine
+        from models.watermark_config import WatermarkConfig, WatermarkType
+        
+        engine = WatermarkEngine()
+        config = WatermarkConfig()
+        config.watermark_type = WatermarkType.TEXT
+        config.text_config.text = "LARGE IMAGE TEST"
+        config.text_config.font_size = 150  # 大字体
+        
+        try:
+            # 直接处理原始尺寸
+            print("使用WatermarkEngine处理原始尺寸...")
+            output_temp = tempfile.NamedTemporaryFile(suffix='_watermarked.jpg', delete=False)
+            output_temp.close()
             
-            # 使用新的水印引擎（不需要QApplication）
-            from core.watermark_engine import WatermarkEngine
-            from models.watermark_config import WatermarkConfig, WatermarkType
-            
-            engine = WatermarkEngine()
-            config = WatermarkConfig()
-            config.watermark_type = WatermarkType.TEXT
-            config.text_config.text = "LARGE IMAGE TEST"
-            config.text_config.font_size = 150  # 大字体
+            result_path = engine.process_image(temp_file.name, config, output_temp.name)
             
-            try:
-                # 直接处理原始尺寸
-                print("使用WatermarkEngine处理原始尺寸...")
-                output_temp = tempfile.NamedTemporaryFile(suffix='_watermarked.jpg', delete=False)
-                output_temp.close()
+            if result_path:
+                print(f"✓ 原始尺寸水印处理成功")
+                print(f"输出文件大小: {os.path.getsize(result_path) / (1024*1024):.1f} MB")
                 
-                result_path = engine.process_image(temp_file.name, config, output_temp.name)
+                # 验证输出
+                with Image.open(result_path) as result_img:
+                    print(f"输出图片尺寸: {result_img.size}")
                 
-                if result_path:
-                    print(f"✓ 原始尺寸水印处理成功")
-                    print(f"输出文件大小: {os.path.getsize(result_path) / (1024*1024):.1f} MB")
-                    
-                    # 验证输出
-                    with Image.open(result_path) as result_img:
-                        print(f"输出图片尺寸: {result_img.size}")
-                    
-                    # 清理输出文件
-                    os.unlink(result_path)
-                else:
-                    print("✗ 原始尺寸水印处理失败")
-                    return False
-                    
-            except MemoryError as e:
-                print(f"✗ 内存错误: {e}")
-                return False
-            except Exception as e:
-                print(f"✗ 处理异常: {e}")
+                # 清理输出文件
+                os.unlink(result_path)
+            else:
+                print("✗ 原始尺寸水印处理失败")
                 return False
+                
+        except MemoryError as e:
+            print(f"✗ 内存错误: {e}")
+            return False
+        except Exception as e:
+            print(f"✗ 处理异常: {e}")
+            return False
         
         # 测试新的水印引擎
         from PyQt5.QtWidgets import QApplication
@@ -150,7 +201,7 @@ def test_large_image_watermark():
             print("使用新的WatermarkEngine处理大图片...")
             result_path = engine.process_image(temp_file.name, config, output_path)
             
-            if result_path and os.path.exists(result_path):
+            if result_path:  # process_image 仅在保存成功后返回路径
                 print(f"✓ 水印处理成功！输出文件: {result_path}")
                 
                 # 检查输出文件
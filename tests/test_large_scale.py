@@ -4,37 +4,59 @@
 """
 import sys
 import os
+import io
 import tempfile
 import shutil
+import time
+from concurrent.futures import ThreadPoolExecutor
 from PIL import Image
 import random
 
-# 添加项目路径
-sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from tests.image_cache import cached_image_path
 
-def create_test_images(count: int = 100, output_dir: str = None) -> str:
-    """创建测试图片文件"""
+
+def _encode_template(spec) -> bytes:
+    """生成一张模板图片并返回其JPEG编码"""
+    size, color, quality = spec
+    
+    # 各线程使用自己的图像，不共享缓冲区
+    img = Image.new('RGB', size, color)
+    
+    # 单遍编码
+    buffer = io.BytesIO()
+    img.save(buffer, 'JPEG', quality=quality, optimize=False)
+    return buffer.getvalue()
+
+def create_test_images(count: int = 100, output_dir: str = None, template_count: int = 16) -> str:
+    """创建测试图片文件
+
+    只编码 template_count 张不同的模板图片，其余文件直接写入模板的编码结果。
+    """
     if output_dir is None:
         output_dir = tempfile.mkdtemp(prefix="photowater_test_")
     
     print(f"创建 {count} 个测试图片到: {output_dir}")
     
+    # 随机参数在主线程中一次生成，结果不受线程调度顺序影响
+    sizes = [(800, 600), (1920, 1080), (3000, 2000), (4000, 3000)]
+    specs = [
+        (
+            random.choice(sizes),  # 不同尺寸
+            (random.randint(0, 255), random.randint(0, 255), random.randint(0, 255)),  # 随机颜色
+            random.randint(70, 95),  # 随机质量
+        )
+        for _ in range(min(count, template_count))
+    ]
+    
+    # 模板只有十几张，不值得启动进程池；libjpeg 编码时会释放GIL，用线程池即可并行
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        templates = list(executor.map(_encode_template, specs))
+    
     for i in range(count):
-        # 创建不同尺寸的测试图片
-        sizes = [(800, 600), (1920, 1080), (3000, 2000), (4000, 3000)]
-        size = random.choice(sizes)
-        
-        # 创建随机颜色的图片
-        color = (random.randint(0, 255), random.randint(0, 255), random.randint(0, 255))
-        img = Image.new('RGB', size, color)
-        
-        # 添加一些简单的内容
         filename = f"test_image_{i:04d}.jpg"
         filepath = os.path.join(output_dir, filename)
-        
-        # 随机质量保存
-        quality = random.randint(70, 95)
-        img.save(filepath, 'JPEG', quality=quality)
+        with open(filepath, 'wb') as f:
+            f.write(random.choice(templates))
         
         if (i + 1) % 10 == 0:
             print(f"已创建 {i + 1}/{count} 个图片")
@@ -102,13 +124,9 @@ def test_large_image_processing():
     print("\n测试大图片处理")
     print("=" * 50)
     
-    # 创建一个大图片
+    # 获取一个大图片（缓存在磁盘上，跨测试运行复用）
     large_size = (6000, 4000)  # 24MP图片
-    test_img = Image.new('RGB', large_size, (100, 150, 200))
-    
-    temp_file = tempfile.NamedTemporaryFile(suffix='.jpg', delete=False)
-    test_img.save(temp_file.name, 'JPEG', quality=90)
-    temp_file.close()
+    test_image_path = cached_image_path(large_size, (100, 150, 200), 'JPEG', quality=90)
     
     try:
         from PyQt5.QtWidgets import QApplication
@@ -126,10 +144,17 @@ def test_large_image_processing():
         
         print("测试大图片预览生成...")
         config = WatermarkConfig()
-        watermarked_pixmap = preview.generate_watermarked_preview(temp_file.name, config)
+        start_time = time.perf_counter()
+        watermarked_pixmap = preview.generate_watermarked_preview(test_image_path, config)
+        elapsed = time.perf_counter() - start_time
         
         if watermarked_pixmap and not watermarked_pixmap.isNull():
-            print(f"✓ 大图片预览生成成功: {watermarked_pixmap.width()}x{watermarked_pixmap.height()}")
+            print(f"✓ 大图片预览生成成功: {watermarked_pixmap.width()}x{watermarked_pixmap.height()} ({elapsed:.2f}s)")
+            
+            # 大图片预览按预览尺寸解码，不应缓存完整原图
+            if preview._original_cache.get(test_image_path) is not None:
+                print("✗ 大图片预览解码了完整原图")
+                return False
         else:
             print("✗ 大图片预览生成失败")
             return False
@@ -139,13 +164,6 @@ def test_large_image_processing():
     except Exception as e:
         print(f"✗ 大图片处理测试失败: {e}")
         return False
-    finally:
-        # 清理临时文件
-        try:
-            os.unlink(temp_file.name)
-            print("✓ 清理临时大图片")
-        except Exception as e:
-            print(f"清理临时文件失败: {e}")
 
 def main():
     """主测试函数"""
@@ -8,14 +8,11 @@ import sys
 import os
 import tempfile
 import shutil
-from PIL import Image
-
-# 添加项目根目录到路径
-project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-sys.path.insert(0, project_root)
 
 from utils.logger import logger
+from tests.log_tail import latest_log
 from models.watermark_config import WatermarkConfig, WatermarkType, WatermarkPosition
+from tests.image_cache import cached_image_path, link_cached_image
 
 def create_test_images_folder():
     """创建测试图片文件夹"""
@@ -29,47 +26,23 @@ def create_test_images_folder():
     sub_folder = os.path.join(test_folder, "subfolder")
     os.makedirs(sub_folder)
     
-    # 创建测试图片
+    # 创建测试图片：图片内容来自磁盘缓存，这里只建立链接
     test_images = []
     
     # 主文件夹中的图片
     for i in range(3):
-        image = Image.new('RGB', (400 + i * 100, 300 + i * 50), 
-                         (255 - i * 50, 100 + i * 50, 150 + i * 30))
-        
-        # 添加文字标识
-        from PIL import ImageDraw, ImageFont
-        draw = ImageDraw.Draw(image)
-        try:
-            font = ImageFont.truetype("arial.ttf", 20)
-        except:
-            font = ImageFont.load_default()
-        
-        text = f"Main Image {i+1}"
-        draw.text((20, 20), text, fill=(255, 255, 255), font=font)
-        
-        # 保存图片
+        source = cached_image_path((400 + i * 100, 300 + i * 50),
+                                   (255 - i * 50, 100 + i * 50, 150 + i * 30),
+                                   'JPEG', quality=85, text=f"Main Image {i+1}")
         image_path = os.path.join(test_folder, f"main_image_{i+1}.jpg")
-        image.save(image_path, 'JPEG', quality=85)
-        test_images.append(image_path)
+        test_images.append(link_cached_image(source, image_path))
     
     # 子文件夹中的图片
     for i in range(2):
-        image = Image.new('RGB', (300, 400), (100 + i * 50, 200 - i * 30, 255 - i * 50))
-        
-        draw = ImageDraw.Draw(image)
-        try:
-            font = ImageFont.truetype("arial.ttf", 20)
-        except:
-            font = ImageFont.load_default()
-        
-        text = f"Sub Image {i+1}"
-        draw.text((20, 20), text, fill=(255, 255, 255), font=font)
-        
-        # 保存图片
+        source = cached_image_path((300, 400), (100 + i * 50, 200 - i * 30, 255 - i * 50),
+                                   'PNG', text=f"Sub Image {i+1}")
         image_path = os.path.join(sub_folder, f"sub_image_{i+1}.png")
-        image.save(image_path, 'PNG')
-        test_images.append(image_path)
+        test_images.append(link_cached_image(source, image_path))
     
     # 添加一些非图片文件
     with open(os.path.join(test_folder, "readme.txt"), 'w') as f:
@@ -92,21 +65,14 @@ def test_preview_logging():
     logger.info("=" * 60)
     
     try:
-        # 创建测试图片
-        test_image = Image.new('RGB', (800, 600), (100, 150, 200))
-        
-        # 添加图案
-        from PIL import ImageDraw
-        draw = ImageDraw.Draw(test_image)
-        draw.rectangle([50, 50, 200, 150], fill=(255, 255, 0))
-        draw.ellipse([300, 200, 500, 400], fill=(255, 0, 255))
-        
-        temp_file = tempfile.NamedTemporaryFile(suffix='_preview_test.jpg', delete=False)
-        temp_file.close()
-        test_image.save(temp_file.name, 'JPEG', quality=90)
+        # 获取测试图片（带图案，缓存在磁盘上）
+        test_image_path = cached_image_path(
+            (800, 600), (100, 150, 200), 'JPEG', quality=90,
+            shapes=(('rectangle', (50, 50, 200, 150), (255, 255, 0)),
+                    ('ellipse', (300, 200, 500, 400), (255, 0, 255))))
         
-        logger.info(f"测试图片已创建: {temp_file.name}")
-        print(f"✓ 创建测试图片: {os.path.basename(temp_file.name)}")
+        logger.info(f"测试图片: {test_image_path}")
+        print(f"✓ 获取测试图片: {os.path.basename(test_image_path)}")
         
         # 导入并测试预览组件
         from ui.widgets.preview_widget import PreviewWidget
@@ -117,7 +83,7 @@ def test_preview_logging():
         
         # 测试设置图片
         logger.info("测试设置预览图片")
-        preview_widget.set_image(temp_file.name)
+        preview_widget.set_image(test_image_path)
         print("✓ 设置预览图片成功")
         
         # 测试水印配置
@@ -146,10 +112,6 @@ def test_preview_logging():
             preview_widget.set_watermark_config(config)
             print(f"✓ {pos_name}水印预览成功")
         
-        # 清理测试文件
-        os.unlink(temp_file.name)
-        logger.info("测试文件清理完成")
-        
         logger.info("=" * 60)
         logger.info("预览图片生成日志功能测试完成")
         logger.info("=" * 60)
@@ -196,19 +158,8 @@ def test_import_progress_dialog():
         logger.info("测试图片列表模型批量添加")
         model = ImageListModel()
         
-        # 分批添加文件
-        chunk_size = 2
-        added_total = 0
-        
-        for i in range(0, len(files_recursive), chunk_size):
-            chunk = files_recursive[i:i + chunk_size]
-            logger.info(f"添加块 {i//chunk_size + 1}: {len(chunk)} 个文件")
-            
-            chunk_added = model.add_images(chunk)
-            added_total += chunk_added
-            
-            logger.debug(f"块 {i//chunk_size + 1} 添加了 {chunk_added} 个文件")
-            print(f"  批次 {i//chunk_size + 1}: 添加 {chunk_added} 个文件")
+        # 一次性批量添加：add_images 内部并行读取图片信息，并且只发出一次 images_changed 信号
+        added_total = model.add_images(files_recursive)
         
         logger.info(f"批量添加完成: 总共添加 {added_total} 个文件")
         print(f"✓ 批量添加完成: {added_total} 个文件")
@@ -282,14 +233,11 @@ def main():
     
     print(f"\n📁 日志文件信息:")
     print("-" * 50)
-    log_dir = "logs"
-    if os.path.exists(log_dir):
-        log_files = sorted([f for f in os.listdir(log_dir) if f.endswith('.log')])
-        if log_files:
-            latest_log = log_files[-1]
-            log_path = os.path.join(log_dir, latest_log)
-            print(f"最新日志: {latest_log}")
-            print(f"大小: {os.path.getsize(log_path)} 字节")
+    latest = latest_log("logs")
+    if latest:
+        log_path, log_size = latest
+        print(f"最新日志: {os.path.basename(log_path)}")
+        print(f"大小: {log_size} 字节")
     
     logger.info("=" * 70)
     logger.info("PhotoWatermark预览和导入功能增强测试完成")
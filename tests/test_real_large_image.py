@@ -8,13 +8,49 @@ import tempfile
 from PIL import Image
 import random
 
-# 添加项目路径
-sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+# NumPy 可选：不可用时退回到逐像素生成
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
-def create_realistic_photo(size=(7000, 4000), target_mb=6.6):
-    """创建更接近真实照片的测试图片"""
+# 向量化生成时每个条带的行数
+STRIP_ROWS = 256
+
+def create_realistic_photo(size=(7000, 4000), target_mb=6.6, seed=None):
+    """创建更接近真实照片的测试图片（相同 seed 生成相同图片）"""
     print(f"创建真实感照片 {size[0]}x{size[1]} 像素 (目标: {target_mb}MB)...")
     
+    if np is None:
+        return _create_realistic_photo_slow(size, seed)
+    
+    width, height = size
+    sky_height = height // 3
+    pixels = np.empty((height, width, 3), dtype=np.uint8)
+    
+    # 创建天空渐变（上半部分）：每行一个颜色，按列广播
+    sky_blue = (135 + np.arange(sky_height) / sky_height * 50).astype(np.uint8)[:, None]
+    pixels[:sky_height, :, 0] = sky_blue
+    pixels[:sky_height, :, 1] = sky_blue + 20
+    pixels[:sky_height, :, 2] = 200
+    
+    # 创建地面（下半部分）：每行一个基础绿色，每个像素一个三通道共用的噪声
+    # 按条带生成，临时数组只占 STRIP_ROWS 行
+    rng = np.random.default_rng(seed)
+    for top in range(sky_height, height, STRIP_ROWS):
+        rows = min(STRIP_ROWS, height - top)
+        ground_green = rng.integers(30, 71, size=(rows, 1), dtype=np.int16)
+        noise = rng.integers(-15, 16, size=(rows, width), dtype=np.int16)
+        for c, base in enumerate((80, ground_green, 40)):
+            pixels[top:top + rows, :, c] = np.clip(base + noise, 0, 255)
+    
+    print("基础图像创建完成")
+    return Image.fromarray(pixels, 'RGB')
+
+def _create_realistic_photo_slow(size, seed=None):
+    """逐像素生成测试图片（NumPy 不可用时使用）"""
+    rand = random.Random(seed)
+    
     # 创建基础风景照片效果
     img = Image.new('RGB', size)
     width, height = size
@@ -27,9 +63,9 @@ def create_realistic_photo(size=(7000, 4000), target_mb=6.6):
     
     # 创建地面（下半部分）
     for y in range(height // 3, height):
-        ground_green = int(50 + random.randint(-20, 20))
+        ground_green = int(50 + rand.randint(-20, 20))
         for x in range(width):
-            noise = random.randint(-15, 15)
+            noise = rand.randint(-15, 15)
             r = max(0, min(255, 80 + noise))
             g = max(0, min(255, ground_green + noise))
             b = max(0, min(255, 40 + noise))
@@ -49,12 +85,16 @@ def test_main_app_with_large_image():
     try:
         # 创建接近真实的大图片
         print("创建测试图片...")
-        large_img = create_realistic_photo((7000, 4000), 6.6)
+        large_img = create_realistic_photo((7000, 4000), 6.6, seed=0)
         
         # 保存为中等质量JPEG以控制文件大小
         large_img.save(temp_file.name, 'JPEG', quality=75)
         temp_file.close()
         
+        # 生成的图片已写入文件，后续只从文件解码：释放内存并归还PIL的内存块缓存
+        del large_img
+        Image.core.clear_cache()
+        
         file_size = os.path.getsize(temp_file.name) / (1024 * 1024)
         print(f"✓ 测试图片已保存: {temp_file.name}")
         print(f"文件大小: {file_size:.1f} MB")
@@ -113,7 +153,7 @@ def test_main_app_with_large_image():
         
         result_path = engine.process_image(temp_file.name, config, output_path)
         
-        if result_path and os.path.exists(result_path):
+        if result_path:  # process_image 仅在保存成功后返回路径
             output_size = os.path.getsize(result_path) / (1024 * 1024)
             print(f"✓ 完整尺寸导出成功: {output_size:.1f} MB")
             
@@ -7,23 +7,38 @@ import os
 import tempfile
 from PIL import Image
 
-# 添加项目路径
-sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
-def test_rgba_save_fix():
+
+def _flatten_to_rgb(img):
+    """将RGBA图片合成到白色背景上并转换为RGB
+
+    直接使用 alpha_composite 一次完成混合，不需要 split() 拆出各通道。
+    """
+    background = Image.new('RGBA', img.size, (255, 255, 255, 255))
+    return Image.alpha_composite(background, img).convert('RGB')
+
+
+def test_rgba_save_fix(engine):
     """测试RGBA模式图片保存修复"""
     print("测试RGBA模式图片保存修复")
     print("=" * 40)
     
     # 创建一个RGBA模式的测试图片
     print("1. 创建RGBA模式测试图片...")
-    test_img = Image.new('RGBA', (1000, 800), (100, 150, 200, 128))  # 半透明背景
-    
-    # 添加一些内容
-    from PIL import ImageDraw
-    draw = ImageDraw.Draw(test_img)
-    draw.rectangle([100, 100, 900, 700], fill=(255, 0, 0, 200))  # 半透明红色矩形
-    draw.text((200, 300), "测试RGBA模式", fill=(255, 255, 255, 255))
+    # 半透明背景 + 半透明红色矩形；文字由水印引擎添加，这里不再绘制
+    if np is not None:
+        canvas = np.empty((800, 1000, 4), dtype=np.uint8)
+        canvas[:] = (100, 150, 200, 128)
+        canvas[100:701, 100:901] = (255, 0, 0, 200)
+        test_img = Image.fromarray(canvas, 'RGBA')
+    else:
+        from PIL import ImageDraw
+        test_img = Image.new('RGBA', (1000, 800), (100, 150, 200, 128))
+        ImageDraw.Draw(test_img).rectangle([100, 100, 900, 700], fill=(255, 0, 0, 200))
     
     print(f"✓ 创建完成，模式: {test_img.mode}")
     
@@ -32,22 +47,18 @@ def test_rgba_save_fix():
     try:
         # 将RGBA转换为RGB（白色背景）以支持JPEG保存
         if test_img.mode == 'RGBA':
-            background = Image.new('RGB', test_img.size, (255, 255, 255))
-            background.paste(test_img, mask=test_img.split()[-1])
-            save_img = background
+            save_img = _flatten_to_rgb(test_img)
         else:
             save_img = test_img
             
-        save_img.save(temp_file.name, 'JPEG', quality=85)
+        save_img.save(temp_file.name, 'JPEG', quality=85, optimize=False, progressive=False, subsampling=2)
         temp_file.close()
         print(f"✓ 临时RGBA图片已保存 (转换为RGB): {temp_file.name}")
         
         # 测试水印引擎处理
         print("\n2. 测试水印引擎处理RGBA图片...")
-        from core.watermark_engine import WatermarkEngine
         from models.watermark_config import WatermarkConfig, WatermarkType
         
-        engine = WatermarkEngine()
         config = WatermarkConfig()
         config.watermark_type = WatermarkType.TEXT
         config.text_config.text = "RGBA测试水印"
@@ -82,7 +93,7 @@ def test_rgba_save_fix():
         except:
             pass
 
-def test_different_modes():
+def test_different_modes(engine):
     """测试不同颜色模式的处理"""
     print("\n测试不同颜色模式处理")
     print("=" * 40)
@@ -94,10 +105,8 @@ def test_different_modes():
         ('P', None)  # 调色板模式
     ]
     
-    from core.watermark_engine import WatermarkEngine
     from models.watermark_config import WatermarkConfig, WatermarkType
     
-    engine = WatermarkEngine()
     config = WatermarkConfig()
     config.watermark_type = WatermarkType.TEXT
     config.text_config.text = "模式测试"
@@ -112,9 +121,9 @@ def test_different_modes():
         try:
             # 创建测试图片
             if mode == 'P':
-                # 调色板模式需要特殊处理
-                test_img = Image.new('RGB', (800, 600), (100, 150, 200))
-                test_img = test_img.quantize(colors=256)
+                # 调色板模式：直接构造单色调色板，无需对纯色图片做量化
+                test_img = Image.new('P', (800, 600), 0)
+                test_img.putpalette(bytes([100, 150, 200] * 256))
             else:
                 test_img = Image.new(mode, (800, 600), color)
             
@@ -123,24 +132,25 @@ def test_different_modes():
             # 保存和处理
             temp_file = tempfile.NamedTemporaryFile(suffix='.jpg', delete=False)
             try:
+                temp_file.close()
+                
                 # 正确处理不兼容JPEG的模式
-                if test_img.mode == 'RGBA':
-                    # RGBA需要合成背景
-                    background = Image.new('RGB', test_img.size, (255, 255, 255))
-                    background.paste(test_img, mask=test_img.split()[-1])
-                    save_img = background
-                elif test_img.mode in ('LA', 'P', 'L'):
-                    # 其他模式直接转换为RGB
-                    save_img = test_img.convert('RGB')
+                if test_img.mode == 'RGB':
+                    # RGB已兼容JPEG，直接处理内存中的图片，省去源图的编码和解码
+                    source = test_img
                 else:
-                    save_img = test_img
-                
-                save_img.save(temp_file.name, 'JPEG', quality=85)
-                temp_file.close()
+                    if test_img.mode == 'RGBA':
+                        # RGBA需要合成背景
+                        save_img = _flatten_to_rgb(test_img)
+                    else:
+                        # 其他模式直接转换为RGB
+                        save_img = test_img.convert('RGB')
+                    save_img.save(temp_file.name, 'JPEG', quality=85, optimize=False, progressive=False, subsampling=2)
+                    source = temp_file.name
                 
                 # 使用水印引擎处理
                 output_path = temp_file.name.replace('.jpg', f'_{mode}_watermarked.jpg')
-                result_path = engine.process_image(temp_file.name, config, output_path)
+                result_path = engine.process_image(source, config, output_path)
                 
                 if result_path and os.path.exists(result_path):
                     print(f"  ✅ {mode} 模式处理成功")
@@ -179,9 +189,13 @@ def main():
     passed = 0
     total = len(tests)
     
+    # 所有测试共用一个水印引擎实例
+    from core.watermark_engine import WatermarkEngine
+    engine = WatermarkEngine()
+    
     for test in tests:
         try:
-            if test():
+            if test(engine):
                 passed += 1
                 print("✅ 测试通过")
             else:
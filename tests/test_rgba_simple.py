@@ -6,8 +6,34 @@ import os
 import tempfile
 from PIL import Image
 
-# 添加项目路径
-sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+def flatten_rgba_to_rgb_np(img, bg=(255, 255, 255)):
+    """将RGBA图片按透明度合成到纯色背景上，返回RGB图片
+
+    使用单个 uint16 临时数组完成混合，除以255用 (t + (t>>8) + 128) >> 8 近似。
+    NumPy 不可用时退回 alpha_composite。
+    """
+    if np is None:
+        background = Image.new('RGBA', img.size, tuple(bg) + (255,))
+        return Image.alpha_composite(background, img).convert('RGB')
+    
+    arr = np.asarray(img, dtype=np.uint16)
+    alpha = arr[..., 3:4]
+    
+    # t = rgb * a + bg * (255 - a)，原地累加到同一个临时数组
+    t = np.multiply(arr[..., :3], alpha)
+    inv_alpha = np.subtract(255, alpha, dtype=np.uint16)
+    t += inv_alpha * np.array(bg, dtype=np.uint16)
+    
+    t += (t >> 8) + 128
+    t >>= 8
+    return Image.fromarray(t.astype(np.uint8), 'RGB')
+
 
 def test_rgba_to_jpeg_conversion():
     """测试RGBA到JPEG的转换"""
@@ -23,13 +49,12 @@ def test_rgba_to_jpeg_conversion():
         print(f"直接转换结果: {rgb_img1.mode}")
         
         # 方法2: 白色背景合成（保留视觉效果）
-        background = Image.new('RGB', rgba_img.size, (255, 255, 255))
-        background.paste(rgba_img, mask=rgba_img.split()[-1])
+        background = flatten_rgba_to_rgb_np(rgba_img)
         print(f"背景合成结果: {background.mode}")
         
         # 测试保存
         temp_file = tempfile.NamedTemporaryFile(suffix='.jpg', delete=False)
-        background.save(temp_file.name, 'JPEG')
+        background.save(temp_file.name, 'JPEG', optimize=False, progressive=False, subsampling=2)
         temp_file.close()
         
         # 验证保存的文件
@@ -53,7 +78,7 @@ def test_watermark_engine_rgba():
         test_img = Image.new('RGB', (400, 300), (100, 150, 200))
         
         temp_file = tempfile.NamedTemporaryFile(suffix='.jpg', delete=False)
-        test_img.save(temp_file.name, 'JPEG')
+        test_img.save(temp_file.name, 'JPEG', optimize=False, progressive=False, subsampling=2)
         temp_file.close()
         
         print(f"测试图片已保存: {temp_file.name}")
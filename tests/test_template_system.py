@@ -1,13 +1,9 @@
 """
 测试模板系统功能
 """
-import os
-import sys
+import io
 import json
 
-# 添加项目根目录到路径
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
 from core.template_manager import TemplateManager, Template
 from models.watermark_config import WatermarkConfig
 
@@ -59,32 +55,28 @@ def test_template_manager():
     else:
         print("   ✗ 获取模板失败")
     
-    # 5. 测试导出模板
+    # 5. 测试导出模板（导出到内存中的文本流，无需临时文件）
     print("\n5. 测试导出模板...")
-    export_path = "temp_test_template.json"
-    if manager.export_template("测试模板", export_path):
-        print(f"   ✓ 模板导出成功: {export_path}")
+    buffer = io.StringIO()
+    exported = manager.export_template_to_stream("测试模板", buffer)
+    if exported:
+        print("   ✓ 模板导出成功")
         
-        # 验证导出的文件
-        if os.path.exists(export_path):
-            with open(export_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                print(f"   文件内容: {data.get('name')}")
+        # 验证导出的内容
+        data = json.loads(buffer.getvalue())
+        print(f"   导出内容: {data.get('name')}")
     else:
         print("   ✗ 模板导出失败")
     
     # 6. 测试导入模板
     print("\n6. 测试导入模板...")
-    if os.path.exists(export_path):
-        imported_template = manager.import_template(export_path)
+    if exported:
+        buffer.seek(0)
+        imported_template = manager.import_template_from_stream(buffer)
         if imported_template:
             print(f"   ✓ 模板导入成功: {imported_template.name}")
         else:
             print("   ✗ 模板导入失败")
-        
-        # 清理临时文件
-        os.remove(export_path)
-        print("   临时文件已清理")
     
     # 7. 测试删除模板
     print("\n7. 测试删除模板...")
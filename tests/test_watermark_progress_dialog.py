@@ -7,21 +7,33 @@
 import sys
 import os
 import tempfile
-from PIL import Image
+import shutil
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
-# 添加项目根目录到路径
-project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-sys.path.insert(0, project_root)
+import pytest
+
+pytest.importorskip("PyQt5.QtWidgets")
 
 from PyQt5.QtWidgets import QApplication
-from utils.logger import logger
+from utils.logger import logger, flush_logs
+from tests.log_tail import latest_log, tail
 from core.watermark_engine import WatermarkEngine
 from models.watermark_config import WatermarkConfig, WatermarkType, WatermarkPosition
 from ui.dialogs.watermark_progress_dialog import WatermarkProgressDialog
+from tests.image_cache import cached_image_path, link_cached_image
+
+# 设置 WATERMARK_TEST_VISUAL=1 以演示速度运行并等待手动关闭，便于观察进度对话框
+_VISUAL = os.environ.get('WATERMARK_TEST_VISUAL') == '1'
 
 def create_test_images(count=3):
-    """创建测试图片"""
+    """创建测试图片
+
+    图片内容来自磁盘缓存，这里只在临时目录中建立链接，返回 (目录, 图片路径列表)。
+    """
     logger.info(f"创建 {count} 个测试图片")
+    test_dir = tempfile.mkdtemp(prefix="progress_test_")
     test_images = []
     
     colors = [(255, 0, 0), (0, 255, 0), (0, 0, 255)]  # 红绿蓝
@@ -31,29 +43,14 @@ def create_test_images(count=3):
         color = colors[i % len(colors)]
         size = sizes[i % len(sizes)]
         
-        # 创建彩色图片
-        image = Image.new('RGB', size, color)
-        
-        # 添加一些文字标识
-        from PIL import ImageDraw, ImageFont
-        draw = ImageDraw.Draw(image)
-        try:
-            font = ImageFont.truetype("arial.ttf", 40)
-        except:
-            font = ImageFont.load_default()
-        
-        text = f"Test Image {i+1}"
-        draw.text((50, 50), text, fill=(255, 255, 255), font=font)
-        
-        # 保存图片
-        temp_file = tempfile.NamedTemporaryFile(suffix=f'_test_{i+1}.jpg', delete=False)
-        temp_file.close()
-        image.save(temp_file.name, 'JPEG', quality=85)
-        
-        test_images.append(temp_file.name)
-        logger.debug(f"创建测试图片: {temp_file.name} ({size[0]}x{size[1]})")
+        # 带文字标识的彩色图片
+        source = cached_image_path(size, color, 'JPEG', quality=85,
+                                   text=f"Test Image {i+1}", text_pos=(50, 50), font_size=40)
+        image_path = os.path.join(test_dir, f"test_{i+1}.jpg")
+        test_images.append(link_cached_image(source, image_path))
+        logger.debug("创建测试图片: %s (%dx%d)", image_path, size[0], size[1])
     
-    return test_images
+    return test_dir, test_images
 
 def test_watermark_progress_dialog():
     """测试水印进度对话框"""
@@ -65,16 +62,18 @@ def test_watermark_progress_dialog():
     logger.info("开始水印处理进度对话框和日志增强测试")
     logger.info("=" * 60)
     
-    app = QApplication(sys.argv)
+    # 复用已存在的应用程序实例（例如整个测试会话共享的实例）
+    app = QApplication.instance() or QApplication(sys.argv)
     
     try:
         # 创建测试图片
-        test_images = create_test_images(3)
+        test_dir, test_images = create_test_images(3)
         logger.info(f"创建了 {len(test_images)} 个测试图片")
         
-        # 创建水印引擎
-        logger.info("初始化水印引擎")
-        engine = WatermarkEngine()
+        # 每个工作线程使用自己的水印引擎：process_image 会按图片设置并保留
+        # 内存保守模式标志，共享同一引擎会让一张大图影响其他线程正在处理的图片
+        logger.info("初始化水印引擎（每个工作线程一个）")
+        worker_state = threading.local()
         
         # 创建水印配置
         logger.info("配置文本水印")
@@ -101,71 +100,77 @@ def test_watermark_progress_dialog():
         
         logger.info("开始模拟水印处理过程")
         
-        for i, image_path in enumerate(test_images):
-            if progress_dialog.cancelled:
-                logger.info("用户取消了处理")
-                break
-            
-            # 更新进度
-            filename = os.path.basename(image_path)
-            progress_dialog.update_progress(filename, i + 1)
+        def process_one(image_path):
+            """在工作线程中处理单张图片，返回输出路径，失败返回None"""
+            base_name = os.path.splitext(os.path.basename(image_path))[0]
+            output_path = os.path.join(output_dir, f"{base_name}_watermarked.jpg")
+            logger.debug("输出路径: %s", output_path)
+            engine = getattr(worker_state, 'engine', None)
+            if engine is None:
+                engine = worker_state.engine = WatermarkEngine()
+            return engine.process_image(image_path, config, output_path)
+        
+        # 图片编解码在线程池中并行（libjpeg 会释放GIL），进度对话框只在主线程更新
+        with ThreadPoolExecutor(max_workers=min(4, os.cpu_count() or 1)) as executor:
+            futures = {executor.submit(process_one, path): path for path in test_images}
             
-            logger.info(f"处理图片 {i+1}/{len(test_images)}: {filename}")
-            
-            try:
-                # 生成输出路径
-                base_name = os.path.splitext(filename)[0]
-                output_path = os.path.join(output_dir, f"{base_name}_watermarked.jpg")
+            for i, future in enumerate(as_completed(futures)):
+                if progress_dialog.cancelled:
+                    logger.info("用户取消了处理")
+                    executor.shutdown(wait=False, cancel_futures=True)
+                    break
                 
-                logger.debug(f"输出路径: {output_path}")
+                # 更新进度
+                filename = os.path.basename(futures[future])
+                progress_dialog.update_progress(filename, i + 1)
                 
-                # 处理图片
-                result = engine.process_image(image_path, config, output_path)
+                logger.info(f"完成图片 {i+1}/{len(test_images)}: {filename}")
                 
-                if result and os.path.exists(result):
-                    exported_count += 1
-                    file_size = os.path.getsize(result)
-                    logger.info(f"✓ 成功处理: {filename} -> {os.path.basename(result)} ({file_size} 字节)")
-                    progress_dialog.add_log(f"✓ 完成: {os.path.basename(result)}")
+                try:
+                    result = future.result()
                     
-                    # 模拟处理时间
-                    import time
-                    time.sleep(1)  # 1秒延迟让用户看到进度
-                    
-                else:
+                    if result and os.path.exists(result):
+                        exported_count += 1
+                        file_size = os.path.getsize(result)
+                        logger.info(f"✓ 成功处理: {filename} -> {os.path.basename(result)} ({file_size} 字节)")
+                        progress_dialog.add_log(f"✓ 完成: {os.path.basename(result)}")
+                        
+                        # 演示模式下延迟1秒让用户看到进度，默认只刷新界面
+                        if _VISUAL:
+                            time.sleep(1)
+                        else:
+                            QApplication.processEvents()
+                        
+                    else:
+                        failed_count += 1
+                        logger.error(f"✗ 处理失败: {filename}")
+                        progress_dialog.add_log(f"✗ 失败: {filename}")
+                        
+                except Exception as e:
                     failed_count += 1
-                    logger.error(f"✗ 处理失败: {filename}")
-                    progress_dialog.add_log(f"✗ 失败: {filename}")
-                    
-            except Exception as e:
-                failed_count += 1
-                logger.error(f"处理异常 {filename}: {str(e)}")
-                progress_dialog.add_log(f"✗ 异常: {filename} - {str(e)[:30]}")
+                    logger.error(f"处理异常 {filename}: {str(e)}")
+                    progress_dialog.add_log(f"✗ 异常: {filename} - {str(e)[:30]}")
         
         # 完成处理
         progress_dialog.finish_processing(exported_count, failed_count)
         
-        # 等待用户关闭对话框
-        logger.info("等待用户关闭进度对话框")
-        result = progress_dialog.exec_()
+        # 演示模式下等待用户关闭对话框，默认直接关闭
+        if _VISUAL:
+            logger.info("等待用户关闭进度对话框")
+            progress_dialog.exec_()
+        else:
+            progress_dialog.close()
         
         logger.info(f"测试完成: 成功 {exported_count}, 失败 {failed_count}")
         
-        # 清理测试文件
+        # 清理测试文件和输出文件
         logger.info("清理测试文件")
-        for image_path in test_images:
+        for directory in (test_dir, output_dir):
             try:
-                os.unlink(image_path)
+                shutil.rmtree(directory)
+                logger.info(f"清理目录: {directory}")
             except Exception as e:
-                logger.warning(f"清理文件失败 {image_path}: {e}")
-        
-        # 清理输出文件
-        import shutil
-        try:
-            shutil.rmtree(output_dir)
-            logger.info(f"清理输出目录: {output_dir}")
-        except Exception as e:
-            logger.warning(f"清理输出目录失败: {e}")
+                logger.warning(f"清理目录失败 {directory}: {e}")
         
         logger.info("=" * 60)
         logger.info("水印处理进度对话框和日志增强测试完成")
@@ -196,24 +201,21 @@ if __name__ == "__main__":
     
     print(f"\n📁 日志文件信息:")
     print("-" * 50)
-    log_dir = "logs"
-    if os.path.exists(log_dir):
-        log_files = sorted([f for f in os.listdir(log_dir) if f.endswith('.log')])
-        if log_files:
-            latest_log = log_files[-1]
-            log_path = os.path.join(log_dir, latest_log)
-            print(f"最新日志: {latest_log}")
-            print(f"大小: {os.path.getsize(log_path)} 字节")
-            
-            # 显示最后几行日志
-            try:
-                with open(log_path, 'r', encoding='utf-8') as f:
-                    lines = f.readlines()
-                    print(f"\n最后3行日志:")
-                    for line in lines[-3:]:
-                        print(f"  {line.strip()}")
-            except Exception as e:
-                print(f"读取日志失败: {e}")
+    # 先写出缓冲中的日志，否则读到的是过期内容
+    flush_logs()
+    latest = latest_log("logs")
+    if latest:
+        log_path, log_size = latest
+        print(f"最新日志: {os.path.basename(log_path)}")
+        print(f"大小: {log_size} 字节")
+        
+        # 显示最后几行日志
+        try:
+            print(f"\n最后3行日志:")
+            for line in tail(log_path, 3):
+                print(f"  {line.strip()}")
+        except Exception as e:
+            print(f"读取日志失败: {e}")
     
     print(f"\n{'🎊 测试成功' if success else '❌ 测试失败'}！")
     print("水印处理功能现在具有完善的用户界面和详细的日志记录。")
@@ -8,17 +8,166 @@ try:
         QPushButton, QProgressBar, QTextEdit, QGroupBox,
         QFrame, QMessageBox
     )
-    from PyQt5.QtCore import Qt, QTimer, pyqtSignal
-    from PyQt5.QtGui import QFont, QPixmap, QIcon
+    from PyQt5.QtCore import Qt, QTimer, QElapsedTimer, pyqtSignal
+    from PyQt5.QtGui import QFont, QPixmap, QIcon, QColor, QTextCharFormat
 except ImportError:
     print("PyQt5 is required but not installed.")
     raise
 
 import os
-from datetime import datetime, timedelta
+from datetime import datetime
 from utils.logger import logger, log_exception
 
 
+# 样式表在模块加载时构建一次，各对话框实例直接复用
+_TITLE_QSS = """
+QLabel {
+    font-family: "Microsoft YaHei UI", "Microsoft YaHei", "SimHei", "黑体", sans-serif;
+    font-size: 18px;
+    font-weight: bold;
+    color: #2c3e50;
+    padding: 10px;
+    text-align: center;
+}
+"""
+
+_GROUP_QSS = """
+QGroupBox {
+    font-family: "Microsoft YaHei UI", "Microsoft YaHei", sans-serif;
+    font-size: 12px;
+    font-weight: bold;
+    color: #2c3e50;
+    border: 2px solid #bdc3c7;
+    border-radius: 6px;
+    margin-top: 10px;
+    padding-top: 8px;
+}
+QGroupBox::title {
+    subcontrol-origin: margin;
+    left: 10px;
+    padding: 0 8px 0 8px;
+    background-color: white;
+}
+"""
+
+_PROGRESS_BAR_QSS = """
+QProgressBar {
+    border: 2px solid #bdc3c7;
+    border-radius: 5px;
+    text-align: center;
+    font-family: "Microsoft YaHei UI", "Microsoft YaHei", sans-serif;
+    font-size: 12px;
+    font-weight: bold;
+}
+QProgressBar::chunk {
+    background-color: #3498db;
+    border-radius: 3px;
+}
+"""
+
+_PROGRESS_LABEL_QSS = """
+QLabel {
+    font-family: "Microsoft YaHei UI", "Microsoft YaHei", sans-serif;
+    font-size: 11px;
+    color: #7f8c8d;
+    padding: 5px;
+}
+"""
+
+_CURRENT_FILE_QSS = """
+QLabel {
+    font-family: "Microsoft YaHei UI", "Microsoft YaHei", sans-serif;
+    font-size: 10px;
+    color: #95a5a6;
+    padding: 2px;
+    background-color: #ecf0f1;
+    border-radius: 3px;
+}
+"""
+
+_PROCESSED_QSS = """
+QLabel {
+    font-family: "Microsoft YaHei UI", "Microsoft YaHei", sans-serif;
+    font-size: 12px;
+    color: #27ae60;
+    font-weight: bold;
+    padding: 3px;
+}
+"""
+
+_FAILED_QSS = """
+QLabel {
+    font-family: "Microsoft YaHei UI", "Microsoft YaHei", sans-serif;
+    font-size: 12px;
+    color: #e74c3c;
+    font-weight: bold;
+    padding: 3px;
+}
+"""
+
+_ELAPSED_QSS = """
+QLabel {
+    font-family: "Microsoft YaHei UI", "Microsoft YaHei", sans-serif;
+    font-size: 12px;
+    color: #3498db;
+    padding: 3px;
+}
+"""
+
+_ETA_QSS = """
+QLabel {
+    font-family: "Microsoft YaHei UI", "Microsoft YaHei", sans-serif;
+    font-size: 12px;
+    color: #f39c12;
+    padding: 3px;
+}
+"""
+
+_LOG_QSS = """
+QTextEdit {
+    font-family: "Microsoft YaHei UI", "Consolas", monospace;
+    font-size: 9px;
+    background-color: #2c3e50;
+    color: #ecf0f1;
+    border: 1px solid #34495e;
+    border-radius: 4px;
+    padding: 5px;
+}
+"""
+
+_CANCEL_BUTTON_QSS = """
+QPushButton {
+    font-family: "Microsoft YaHei UI", "Microsoft YaHei", sans-serif;
+    background-color: #e74c3c;
+    color: white;
+    border: none;
+    padding: 10px 20px;
+    border-radius: 5px;
+    font-weight: bold;
+    min-width: 100px;
+}
+QPushButton:hover {
+    background-color: #c0392b;
+}
+"""
+
+_CLOSE_BUTTON_QSS = """
+QPushButton {
+    font-family: "Microsoft YaHei UI", "Microsoft YaHei", sans-serif;
+    background-color: #27ae60;
+    color: white;
+    border: none;
+    padding: 10px 20px;
+    border-radius: 5px;
+    font-weight: bold;
+    min-width: 100px;
+}
+QPushButton:hover {
+    background-color: #229954;
+}
+"""
+
+
 class ExportProgressDialog(QDialog):
     """导出进度对话框"""
     
@@ -29,9 +178,15 @@ class ExportProgressDialog(QDialog):
         super().__init__(parent)
         self.total_files = total_files
         self.processed_files = 0
-        self.start_time = None
+        self.elapsed_timer = QElapsedTimer()  # 单调计时，不受系统时间调整影响
         self.is_completed = False
         self.is_cancelled = False
+        self._last_processed_seen = -1  # 上次计算预计剩余时间时的已处理文件数
+        
+        # 待刷新的界面状态，由 flush_timer 定时合并刷新，避免每个文件都触发重绘
+        self._pending_progress = None
+        self._pending_file = None
+        self._pending_logs = []
         
         self.setWindowTitle("批量导出进度")
         self.setFixedSize(600, 500)
@@ -52,16 +207,7 @@ class ExportProgressDialog(QDialog):
         
         # 标题
         title_label = QLabel("批量导出进行中...")
-        title_label.setStyleSheet("""
-            QLabel {
-                font-family: "Microsoft YaHei UI", "Microsoft YaHei", "SimHei", "黑体", sans-serif;
-                font-size: 18px;
-                font-weight: bold;
-                color: #2c3e50;
-                padding: 10px;
-                text-align: center;
-            }
-        """)
+        title_label.setStyleSheet(_TITLE_QSS)
         title_label.setAlignment(Qt.AlignCenter)
         layout.addWidget(title_label)
         
@@ -86,24 +232,7 @@ class ExportProgressDialog(QDialog):
     def create_progress_group(self):
         """创建进度显示组"""
         group = QGroupBox("导出进度")
-        group.setStyleSheet("""
-            QGroupBox {
-                font-family: "Microsoft YaHei UI", "Microsoft YaHei", sans-serif;
-                font-size: 12px;
-                font-weight: bold;
-                color: #2c3e50;
-                border: 2px solid #bdc3c7;
-                border-radius: 6px;
-                margin-top: 10px;
-                padding-top: 8px;
-            }
-            QGroupBox::title {
-                subcontrol-origin: margin;
-                left: 10px;
-                padding: 0 8px 0 8px;
-                background-color: white;
-            }
-        """)
+        group.setStyleSheet(_GROUP_QSS)
         
         layout = QVBoxLayout()
         
@@ -111,46 +240,17 @@ class ExportProgressDialog(QDialog):
         self.main_progress = QProgressBar()
         self.main_progress.setRange(0, 100)
         self.main_progress.setValue(0)
-        self.main_progress.setStyleSheet("""
-            QProgressBar {
-                border: 2px solid #bdc3c7;
-                border-radius: 5px;
-                text-align: center;
-                font-family: "Microsoft YaHei UI", "Microsoft YaHei", sans-serif;
-                font-size: 12px;
-                font-weight: bold;
-            }
-            QProgressBar::chunk {
-                background-color: #3498db;
-                border-radius: 3px;
-            }
-        """)
+        self.main_progress.setStyleSheet(_PROGRESS_BAR_QSS)
         layout.addWidget(self.main_progress)
         
         # 进度文本
         self.progress_label = QLabel("准备开始...")
-        self.progress_label.setStyleSheet("""
-            QLabel {
-                font-family: "Microsoft YaHei UI", "Microsoft YaHei", sans-serif;
-                font-size: 11px;
-                color: #7f8c8d;
-                padding: 5px;
-            }
-        """)
+        self.progress_label.setStyleSheet(_PROGRESS_LABEL_QSS)
         layout.addWidget(self.progress_label)
         
         # 当前处理文件
         self.current_file_label = QLabel("")
-        self.current_file_label.setStyleSheet("""
-            QLabel {
-                font-family: "Microsoft YaHei UI", "Microsoft YaHei", sans-serif;
-                font-size: 10px;
-                color: #95a5a6;
-                padding: 2px;
-                background-color: #ecf0f1;
-                border-radius: 3px;
-            }
-        """)
+        self.current_file_label.setStyleSheet(_CURRENT_FILE_QSS)
         self.current_file_label.setWordWrap(True)
         layout.addWidget(self.current_file_label)
         
@@ -170,52 +270,22 @@ class ExportProgressDialog(QDialog):
         left_status = QVBoxLayout()
         
         self.processed_label = QLabel("已处理: 0/0")
-        self.processed_label.setStyleSheet("""
-            QLabel {
-                font-family: "Microsoft YaHei UI", "Microsoft YaHei", sans-serif;
-                font-size: 12px;
-                color: #27ae60;
-                font-weight: bold;
-                padding: 3px;
-            }
-        """)
+        self.processed_label.setStyleSheet(_PROCESSED_QSS)
         left_status.addWidget(self.processed_label)
         
         self.failed_label = QLabel("失败: 0")
-        self.failed_label.setStyleSheet("""
-            QLabel {
-                font-family: "Microsoft YaHei UI", "Microsoft YaHei", sans-serif;
-                font-size: 12px;
-                color: #e74c3c;
-                font-weight: bold;
-                padding: 3px;
-            }
-        """)
+        self.failed_label.setStyleSheet(_FAILED_QSS)
         left_status.addWidget(self.failed_label)
         
         # 右列状态
         right_status = QVBoxLayout()
         
         self.elapsed_label = QLabel("已用时间: 00:00:00")
-        self.elapsed_label.setStyleSheet("""
-            QLabel {
-                font-family: "Microsoft YaHei UI", "Microsoft YaHei", sans-serif;
-                font-size: 12px;
-                color: #3498db;
-                padding: 3px;
-            }
-        """)
+        self.elapsed_label.setStyleSheet(_ELAPSED_QSS)
         right_status.addWidget(self.elapsed_label)
         
         self.eta_label = QLabel("预计剩余: 计算中...")
-        self.eta_label.setStyleSheet("""
-            QLabel {
-                font-family: "Microsoft YaHei UI", "Microsoft YaHei", sans-serif;
-                font-size: 12px;
-                color: #f39c12;
-                padding: 3px;
-            }
-        """)
+        self.eta_label.setStyleSheet(_ETA_QSS)
         right_status.addWidget(self.eta_label)
         
         status_layout.addLayout(left_status)
@@ -234,20 +304,18 @@ class ExportProgressDialog(QDialog):
         # 日志文本区域
         self.log_text = QTextEdit()
         self.log_text.setMaximumHeight(150)
-        self.log_text.setStyleSheet("""
-            QTextEdit {
-                font-family: "Microsoft YaHei UI", "Consolas", monospace;
-                font-size: 9px;
-                background-color: #2c3e50;
-                color: #ecf0f1;
-                border: 1px solid #34495e;
-                border-radius: 4px;
-                padding: 5px;
-            }
-        """)
+        self.log_text.setStyleSheet(_LOG_QSS)
         self.log_text.setReadOnly(True)
+        # 只保留最近的日志行，避免大批量导出时文档无限增长
+        self.log_text.document().setMaximumBlockCount(500)
         layout.addWidget(self.log_text)
         
+        # 日志行直接以纯文本加颜色格式写入，不再逐行解析 HTML
+        self.log_format = QTextCharFormat()
+        self.log_format.setForeground(QColor("#ecf0f1"))
+        self.error_log_format = QTextCharFormat()
+        self.error_log_format.setForeground(QColor("#e74c3c"))
+        
         group.setLayout(layout)
         return group
     
@@ -258,21 +326,7 @@ class ExportProgressDialog(QDialog):
         
         # 取消/关闭按钮
         self.action_button = QPushButton("取消导出")
-        self.action_button.setStyleSheet("""
-            QPushButton {
-                font-family: "Microsoft YaHei UI", "Microsoft YaHei", sans-serif;
-                background-color: #e74c3c;
-                color: white;
-                border: none;
-                padding: 10px 20px;
-                border-radius: 5px;
-                font-weight: bold;
-                min-width: 100px;
-            }
-            QPushButton:hover {
-                background-color: #c0392b;
-            }
-        """)
+        self.action_button.setStyleSheet(_CANCEL_BUTTON_QSS)
         self.action_button.clicked.connect(lambda: self.on_action_button_clicked())
         
         layout.addWidget(self.action_button)
@@ -283,35 +337,61 @@ class ExportProgressDialog(QDialog):
         self.update_timer = QTimer()
         self.update_timer.timeout.connect(self.update_time_info)
         self.update_timer.start(1000)  # 每秒更新一次时间信息
+        
+        # 进度与日志合并刷新，界面最多约 20 次/秒重绘
+        self.flush_timer = QTimer()
+        self.flush_timer.timeout.connect(self._flush_updates)
+        self.flush_timer.start(50)
     
     def start_export(self):
         """开始导出"""
-        self.start_time = datetime.now()
+        self.elapsed_timer.start()
         self.add_log("开始批量导出...")
         logger.info("导出进度对话框已启动")
     
-    @log_exception
     def update_progress(self, progress, current_file=""):
-        """更新进度"""
-        # 更新进度条
-        self.main_progress.setValue(progress)
+        """更新进度（仅记录状态，由 _flush_updates 统一刷新界面）"""
+        self._pending_progress = progress
         
-        # 更新进度文本
-        self.progress_label.setText(f"进度: {progress}% ({self.processed_files}/{self.total_files})")
-        
-        # 更新当前文件
         if current_file:
-            self.current_file_label.setText(f"正在处理: {current_file}")
+            self._pending_file = current_file
             self.add_log(f"处理文件: {current_file}")
         
-        # 更新处理计数
+        # 更新处理计数（预计剩余时间依赖该值）
         if progress > 0:
             self.processed_files = int((progress / 100) * self.total_files)
-            self.processed_label.setText(f"已处理: {self.processed_files}/{self.total_files}")
         
-        logger.debug(f"更新导出进度: {progress}%, 当前文件: {current_file}")
+        logger.debug("更新导出进度: %s%%, 当前文件: %s", progress, current_file)
+    
+    def _flush_updates(self):
+        """将累积的进度和日志一次性刷新到界面"""
+        if self._pending_progress is not None:
+            progress = self._pending_progress
+            self._pending_progress = None
+            self.main_progress.setValue(progress)
+            self.progress_label.setText(f"进度: {progress}% ({self.processed_files}/{self.total_files})")
+            if progress > 0:
+                self.processed_label.setText(f"已处理: {self.processed_files}/{self.total_files}")
+        
+        if self._pending_file is not None:
+            self.current_file_label.setText(f"正在处理: {self._pending_file}")
+            self._pending_file = None
+        
+        if self._pending_logs:
+            scrollbar = self.log_text.verticalScrollBar()
+            at_bottom = scrollbar.value() == scrollbar.maximum()
+            
+            cursor = self.log_text.textCursor()
+            cursor.movePosition(cursor.End)
+            for log_entry, is_error in self._pending_logs:
+                fmt = self.error_log_format if is_error else self.log_format
+                cursor.insertText(f"{log_entry}\n", fmt)
+            self._pending_logs = []
+            
+            # 用户没有向上翻看日志时才自动滚动到底部
+            if at_bottom:
+                self.log_text.setTextCursor(cursor)
     
-    @log_exception
     def update_error(self, filename, error_message):
         """更新错误信息"""
         error_log = f"错误: {filename} - {error_message}"
@@ -324,27 +404,27 @@ class ExportProgressDialog(QDialog):
     
     def update_time_info(self):
         """更新时间信息"""
-        if not self.start_time:
+        if not self.elapsed_timer.isValid():
             return
         
         # 计算已用时间
-        elapsed = datetime.now() - self.start_time
-        elapsed_str = self.format_timedelta(elapsed)
-        self.elapsed_label.setText(f"已用时间: {elapsed_str}")
-        
-        # 计算预计剩余时间
-        if self.processed_files > 0 and not self.is_completed:
-            avg_time_per_file = elapsed.total_seconds() / self.processed_files
-            remaining_files = self.total_files - self.processed_files
-            eta_seconds = avg_time_per_file * remaining_files
-            eta_str = self.format_timedelta(timedelta(seconds=eta_seconds))
-            self.eta_label.setText(f"预计剩余: {eta_str}")
-        elif self.is_completed:
-            self.eta_label.setText("已完成")
+        elapsed_ms = self.elapsed_timer.elapsed()
+        self.elapsed_label.setText(f"已用时间: {self.format_seconds(elapsed_ms // 1000)}")
+        
+        # 预计剩余时间只取决于已处理文件数，数量变化时才重新计算
+        if self.is_completed:
+            if self._last_processed_seen is not None:
+                self.eta_label.setText("已完成")
+                self._last_processed_seen = None
+        elif self.processed_files != self._last_processed_seen:
+            self._last_processed_seen = self.processed_files
+            if self.processed_files > 0:
+                remaining_files = self.total_files - self.processed_files
+                eta_seconds = elapsed_ms * remaining_files // (self.processed_files * 1000)
+                self.eta_label.setText(f"预计剩余: {self.format_seconds(eta_seconds)}")
     
-    def format_timedelta(self, td):
-        """格式化时间差"""
-        total_seconds = int(td.total_seconds())
+    def format_seconds(self, total_seconds):
+        """将秒数格式化为 HH:MM:SS"""
         hours = total_seconds // 3600
         minutes = (total_seconds % 3600) // 60
         seconds = total_seconds % 60
@@ -354,6 +434,9 @@ class ExportProgressDialog(QDialog):
     def export_completed(self, stats):
         """导出完成"""
         self.is_completed = True
+        self.flush_timer.stop()
+        self._pending_progress = None
+        self._pending_file = None
         
         # 更新界面
         self.main_progress.setValue(100)
@@ -366,21 +449,7 @@ class ExportProgressDialog(QDialog):
         
         # 更新按钮
         self.action_button.setText("关闭")
-        self.action_button.setStyleSheet("""
-            QPushButton {
-                font-family: "Microsoft YaHei UI", "Microsoft YaHei", sans-serif;
-                background-color: #27ae60;
-                color: white;
-                border: none;
-                padding: 10px 20px;
-                border-radius: 5px;
-                font-weight: bold;
-                min-width: 100px;
-            }
-            QPushButton:hover {
-                background-color: #229954;
-            }
-        """)
+        self.action_button.setStyleSheet(_CLOSE_BUTTON_QSS)
         
         # 添加完成日志
         success_rate = (stats['processed'] / stats['total']) * 100
@@ -392,6 +461,9 @@ class ExportProgressDialog(QDialog):
             error_summary = f"共有 {stats['failed']} 个文件处理失败"
             self.add_log(error_summary, is_error=True)
         
+        # 完成后不再有后续更新，立即输出剩余日志
+        self._flush_updates()
+        
         logger.info(f"批量导出完成: {completion_msg}")
         
         # 显示完成通知
@@ -404,20 +476,9 @@ class ExportProgressDialog(QDialog):
                               f"成功: {stats['processed']} 个文件")
     
     def add_log(self, message, is_error=False):
-        """添加日志"""
+        """添加日志（先缓存，由 _flush_updates 批量写入）"""
         timestamp = datetime.now().strftime("%H:%M:%S")
-        
-        if is_error:
-            log_entry = f"<span style='color: #e74c3c;'>[{timestamp}] {message}</span>"
-        else:
-            log_entry = f"<span style='color: #ecf0f1;'>[{timestamp}] {message}</span>"
-        
-        self.log_text.append(log_entry)
-        
-        # 自动滚动到底部
-        cursor = self.log_text.textCursor()
-        cursor.movePosition(cursor.End)
-        self.log_text.setTextCursor(cursor)
+        self._pending_logs.append((f"[{timestamp}] {message}", is_error))
     
     @log_exception
     def on_action_button_clicked(self):
@@ -460,6 +521,8 @@ class ExportProgressDialog(QDialog):
         
         if hasattr(self, 'update_timer'):
             self.update_timer.stop()
+        if hasattr(self, 'flush_timer'):
+            self.flush_timer.stop()
         
         event.accept()
         logger.debug("导出进度对话框已关闭")
\ No newline at end of file
@@ -10,7 +10,7 @@ try:
         QButtonGroup, QFormLayout, QTextEdit, QSplitter,
         QWidget, QFrame, QMessageBox
     )
-    from PyQt5.QtCore import Qt, pyqtSignal
+    from PyQt5.QtCore import Qt, QTimer, QSignalBlocker, pyqtSignal, pyqtSlot
     from PyQt5.QtGui import QFont, QPixmap, QPainter
 except ImportError:
     print("PyQt5 is required but not installed.")
@@ -21,6 +21,158 @@ from models.watermark_config import WatermarkConfig
 from utils.logger import logger, log_exception
 
 
+# 命名示例使用的原文件名，预先拆分为 (文件名, 扩展名)
+_SAMPLE_SPLITS = tuple(os.path.splitext(name) for name in ("photo1.jpg", "IMG_001.png", "picture.bmp"))
+
+# 对话框统一样式表：模块加载时构建一次，由对话框整体设置，控件通过 objectName 或 cls 属性匹配
+_DIALOG_QSS = """
+QLabel#dialogTitle {
+    font-family: "Microsoft YaHei UI", "Microsoft YaHei", "SimHei", "黑体", sans-serif;
+    font-size: 18px;
+    font-weight: bold;
+    color: #2c3e50;
+    padding: 0px;
+    border-bottom: 2px solid #3498db;
+    margin-bottom: 0px;
+}
+QLabel#previewTitle {
+    font-family: "Microsoft YaHei UI", "Microsoft YaHei", sans-serif;
+    font-size: 15px;
+    font-weight: bold;
+    color: #2c3e50;
+    padding: 8px;
+    border-bottom: 1px solid #bdc3c7;
+    margin-bottom: 8px;
+}
+QLabel#sectionTitle {
+    font-family: "Microsoft YaHei UI", "Microsoft YaHei", sans-serif;
+    font-size: 13px;
+    font-weight: bold;
+    color: #2c3e50;
+    padding: 5px 0px;
+}
+QLabel[cls="field"] {
+    font-family: "Microsoft YaHei UI", "Microsoft YaHei", sans-serif;
+    font-size: 12px;
+    color: #2c3e50;
+}
+QLabel[cls="inputLabel"] {
+    font-family: "Microsoft YaHei UI", "Microsoft YaHei", sans-serif;
+    font-size: 12px;
+    color: #2c3e50;
+    min-width: 40px;
+}
+QLabel[cls="hint"] {
+    font-size: 12px;
+    color: #7f8c8d;
+    padding: 4px;
+    background-color: #ecf0f1;
+    border-radius: 3px;
+}
+QTextEdit#previewInfo {
+    font-family: "Microsoft YaHei UI", "Consolas", monospace;
+    font-size: 12px;
+    background-color: #f8f9fa;
+    border: 1px solid #dee2e6;
+    border-radius: 4px;
+    padding: 8px;
+    color: #495057;
+}
+QRadioButton[cls="option"], QCheckBox[cls="option"] {
+    font-family: "Microsoft YaHei UI", "Microsoft YaHei", sans-serif;
+    font-size: 12px;
+    color: #2c3e50;
+    padding: 0px;
+    spacing: 8px;
+}
+QRadioButton[cls="option"]::indicator, QCheckBox[cls="option"]::indicator {
+    width: 16px;
+    height: 16px;
+}
+QComboBox#resizeModeCombo {
+    font-family: "Microsoft YaHei UI", "Microsoft YaHei", sans-serif;
+    font-size: 12px;
+    color: #2c3e50;
+    background-color: white;
+    border: 1px solid #bdc3c7;
+    border-radius: 3px;
+    padding: 3px 5px;
+}
+QComboBox#resizeModeCombo:hover {
+    border-color: #3498db;
+}
+QComboBox#resizeModeCombo::drop-down {
+    border: none;
+}
+QComboBox#resizeModeCombo QAbstractItemView {
+    color: #2c3e50;
+    background-color: white;
+    selection-background-color: #3498db;
+    selection-color: white;
+}
+QComboBox#resizeModeCombo QAbstractItemView::item {
+    color: #2c3e50;
+    padding: 3px 5px;
+}
+QComboBox#resizeModeCombo QAbstractItemView::item:hover {
+    color: #2c3e50;
+    background-color: #e8f4f8;
+}
+QLineEdit[cls="input"] {
+    font-family: "Microsoft YaHei UI", "Microsoft YaHei", sans-serif;
+    font-size: 12px;
+    color: #2c3e50;
+    padding: 10px;
+    border: 1px solid #bdc3c7;
+    border-radius: 4px;
+    background-color: white;
+    min-height: 15px;
+}
+QLineEdit[cls="input"]:disabled {
+    background-color: #f8f9fa;
+    color: #6c757d;
+    border-color: #dee2e6;
+}
+QLineEdit[cls="input"]:focus {
+    border-color: #3498db;
+    border-width: 2px;
+}
+QPushButton#browseBtn {
+    font-family: "Microsoft YaHei UI", "Microsoft YaHei", sans-serif;
+    background-color: #3498db;
+    color: white;
+    border: none;
+    padding: 8px 16px;
+    border-radius: 4px;
+    font-weight: bold;
+}
+QPushButton#browseBtn:hover {
+    background-color: #2980b9;
+}
+QPushButton#cancelBtn, QPushButton#exportBtn {
+    font-family: "Microsoft YaHei UI", "Microsoft YaHei", sans-serif;
+    color: white;
+    border: none;
+    padding: 10px 20px;
+    border-radius: 5px;
+    font-weight: bold;
+    min-width: 80px;
+}
+QPushButton#cancelBtn {
+    background-color: #e74c3c;
+}
+QPushButton#cancelBtn:hover {
+    background-color: #c0392b;
+}
+QPushButton#exportBtn {
+    background-color: #27ae60;
+}
+QPushButton#exportBtn:hover {
+    background-color: #229954;
+}
+"""
+
+
 class ExportSettingsDialog(QDialog):
     """导出设置对话框"""
     
@@ -31,15 +183,25 @@ class ExportSettingsDialog(QDialog):
         super().__init__(parent)
         self.total_images = total_images
         self.image_list = image_list or []  # 保存图片列表用于检查源目录
+        self._source_path_cache = {}  # 源路径 -> (比较用源目录, 比较用源路径)，每个文件只规范化一次
         self.export_config = {}
         
         self.setWindowTitle("导出设置")
         self.setFixedSize(800, 1000)
         self.setModal(True)
+        self.setStyleSheet(_DIALOG_QSS)
         
         logger.debug(f"创建导出设置对话框，总计 {total_images} 张图片")
         
         self.init_ui()
+        
+        # 预览合并刷新：连续输入或拖动滑块时只在停止变化后重建一次预览
+        self._preview_timer = QTimer(self)
+        self._preview_timer.setSingleShot(True)
+        self._preview_timer.setInterval(80)
+        self._preview_timer.timeout.connect(self._do_update_preview)
+        self._last_preview_key = None  # 上次生成预览时的输入，未变化时跳过重建
+        
         self.setup_default_values()
         self.connect_signals()
     
@@ -51,17 +213,7 @@ class ExportSettingsDialog(QDialog):
         
         # 标题
         title_label = QLabel("批量导出设置")
-        title_label.setStyleSheet("""
-            QLabel {
-                font-family: "Microsoft YaHei UI", "Microsoft YaHei", "SimHei", "黑体", sans-serif;
-                font-size: 18px;
-                font-weight: bold;
-                color: #2c3e50;
-                padding: 0px;
-                border-bottom: 2px solid #3498db;
-                margin-bottom: 0px;
-            }
-        """)
+        title_label.setObjectName("dialogTitle")
         layout.addWidget(title_label)
         
         # 创建左右分栏
@@ -86,49 +238,15 @@ class ExportSettingsDialog(QDialog):
         left_layout.addStretch()
         left_widget.setLayout(left_layout)
         
-        # 右侧预览面板
+        # 右侧预览面板（内容在首次显示时由 _build_preview_pane 创建）
+        self._preview_built = False
+        self.right_layout = QVBoxLayout()
+        self.right_layout.setContentsMargins(0, 0, 0, 0)
         right_widget = QWidget()
-        right_layout = QVBoxLayout()
-        
-        # 预览标题
-        preview_title = QLabel("导出信息预览")
-        preview_title.setStyleSheet("""
-            QLabel {
-                font-family: "Microsoft YaHei UI", "Microsoft YaHei", sans-serif;
-                font-size: 15px;
-                font-weight: bold;
-                color: #2c3e50;
-                padding: 8px;
-                border-bottom: 1px solid #bdc3c7;
-                margin-bottom: 8px;
-            }
-        """)
-        right_layout.addWidget(preview_title)
-        
-        # 预览信息
-        self.preview_info = QTextEdit()
-        self.preview_info.setFixedHeight(650)
-        self.preview_info.setStyleSheet("""
-            QTextEdit {
-                font-family: "Microsoft YaHei UI", "Consolas", monospace;
-                font-size: 12px;
-                background-color: #f8f9fa;
-                border: 1px solid #dee2e6;
-                border-radius: 4px;
-                padding: 8px;
-                color: #495057;
-            }
-        """)
-        right_layout.addWidget(self.preview_info)
-        
-        # 处理统计
-        stats_group = self.create_stats_group()
-        right_layout.addWidget(stats_group)
-        
-        right_layout.addStretch()
-        right_widget.setLayout(right_layout)
+        right_widget.setLayout(self.right_layout)
         
         # 设置分栏比例
+        self.splitter = splitter
         splitter.addWidget(left_widget)
         splitter.addWidget(right_widget)
         splitter.setStretchFactor(0, 2)  # 左侧占2/3
@@ -142,6 +260,44 @@ class ExportSettingsDialog(QDialog):
         
         self.setLayout(layout)
     
+    def _build_preview_pane(self):
+        """创建右侧预览面板并生成初始预览（首次显示时调用一次）"""
+        pane = QWidget()
+        pane_layout = QVBoxLayout()
+        
+        # 预览标题
+        preview_title = QLabel("导出信息预览")
+        preview_title.setObjectName("previewTitle")
+        pane_layout.addWidget(preview_title)
+        
+        # 预览信息
+        self.preview_info = QTextEdit()
+        self.preview_info.setFixedHeight(650)
+        self.preview_info.setObjectName("previewInfo")
+        pane_layout.addWidget(self.preview_info)
+        
+        # 处理统计
+        stats_group = self.create_stats_group()
+        pane_layout.addWidget(stats_group)
+        
+        pane_layout.addStretch()
+        pane.setLayout(pane_layout)
+        self.right_layout.addWidget(pane)
+        pane.show()
+        
+        # 面板在分栏尺寸确定后才加入，重新按 2:1 分配宽度
+        width = self.splitter.width()
+        self.splitter.setSizes([width * 2 // 3, width - width * 2 // 3])
+        
+        self._preview_built = True
+        self._do_update_preview()
+    
+    def showEvent(self, event):
+        """首次显示时创建预览面板"""
+        if not self._preview_built:
+            self._build_preview_pane()
+        super().showEvent(event)
+    
     def create_format_group(self):
         """创建输出格式设置组"""
         group = QGroupBox("输出格式")
@@ -156,23 +312,8 @@ class ExportSettingsDialog(QDialog):
         self.bmp_radio = QRadioButton("BMP - 无损质量，大文件")
         self.tiff_radio = QRadioButton("TIFF - 专业格式，最高质量")
         
-        # 设置radio button样式以确保中文显示正确
-        radio_style = """
-            QRadioButton {
-                font-family: "Microsoft YaHei UI", "Microsoft YaHei", sans-serif;
-                font-size: 12px;
-                color: #2c3e50;
-                padding: 0px;
-                spacing: 8px;
-            }
-            QRadioButton::indicator {
-                width: 16px;
-                height: 16px;
-            }
-        """
-        
         for radio in [self.jpeg_radio, self.png_radio, self.bmp_radio, self.tiff_radio]:
-            radio.setStyleSheet(radio_style)
+            radio.setProperty("cls", "option")
         
         self.format_buttons.addButton(self.jpeg_radio, 0)
         self.format_buttons.addButton(self.png_radio, 1)
@@ -190,19 +331,7 @@ class ExportSettingsDialog(QDialog):
         # JPEG质量设置
         quality_layout = QHBoxLayout()
         quality_label = QLabel("JPEG质量:")
-        quality_label.setStyleSheet("""
-                QLabel {
-                    font-family: "Microsoft YaHei UI", "Microsoft YaHei", sans-serif;
-                    font-size: 12px;
-                    color: #2c3e50;
-                    padding: 0px;
-                    spacing: 8px;
-                }
-                QLabel::indicator {
-                    width: 16px;
-                    height: 16px;
-                }
-            """)
+        quality_label.setProperty("cls", "field")
         self.quality_slider = QSlider(Qt.Horizontal)
         self.quality_slider.setRange(60, 100)
         self.quality_slider.setValue(100)
@@ -216,19 +345,7 @@ class ExportSettingsDialog(QDialog):
         
         # 保持原始格式选项
         self.keep_original_format = QCheckBox("保持原始格式（推荐）")
-        self.keep_original_format.setStyleSheet("""
-            QCheckBox {
-                font-family: "Microsoft YaHei UI", "Microsoft YaHei", sans-serif;
-                font-size: 12px;
-                color: #2c3e50;
-                padding: 0px;
-                spacing: 8px;
-            }
-            QCheckBox::indicator {
-                width: 16px;
-                height: 16px;
-            }
-        """)
+        self.keep_original_format.setProperty("cls", "option")
         layout.addWidget(self.keep_original_format)
         
         # 添加分隔线
@@ -239,77 +356,21 @@ class ExportSettingsDialog(QDialog):
         
         # 图片尺寸缩放设置
         resize_title = QLabel("图片尺寸缩放")
-        resize_title.setStyleSheet("""
-            QLabel {
-                font-family: "Microsoft YaHei UI", "Microsoft YaHei", sans-serif;
-                font-size: 13px;
-                font-weight: bold;
-                color: #2c3e50;
-                padding: 5px 0px;
-            }
-        """)
+        resize_title.setObjectName("sectionTitle")
         layout.addWidget(resize_title)
         
         # 启用缩放选项
         self.enable_resize = QCheckBox("调整图片尺寸")
-        self.enable_resize.setStyleSheet("""
-            QCheckBox {
-                font-family: "Microsoft YaHei UI", "Microsoft YaHei", sans-serif;
-                font-size: 12px;
-                color: #2c3e50;
-                padding: 0px;
-                spacing: 8px;
-            }
-            QCheckBox::indicator {
-                width: 16px;
-                height: 16px;
-            }
-        """)
+        self.enable_resize.setProperty("cls", "option")
         layout.addWidget(self.enable_resize)
         
         # 缩放模式选择
         resize_mode_layout = QHBoxLayout()
         resize_mode_label = QLabel("缩放模式:")
-        resize_mode_label.setStyleSheet("""
-            QLabel {
-                font-family: "Microsoft YaHei UI", "Microsoft YaHei", sans-serif;
-                font-size: 12px;
-                color: #2c3e50;
-            }
-        """)
+        resize_mode_label.setProperty("cls", "field")
         self.resize_mode_combo = QComboBox()
         self.resize_mode_combo.addItems(["按百分比缩放", "指定最长边", "指定宽度", "指定高度"])
-        self.resize_mode_combo.setStyleSheet("""
-            QComboBox {
-                font-family: "Microsoft YaHei UI", "Microsoft YaHei", sans-serif;
-                font-size: 12px;
-                color: #2c3e50;
-                background-color: white;
-                border: 1px solid #bdc3c7;
-                border-radius: 3px;
-                padding: 3px 5px;
-            }
-            QComboBox:hover {
-                border-color: #3498db;
-            }
-            QComboBox::drop-down {
-                border: none;
-            }
-            QComboBox QAbstractItemView {
-                color: #2c3e50;
-                background-color: white;
-                selection-background-color: #3498db;
-                selection-color: white;
-            }
-            QComboBox QAbstractItemView::item {
-                color: #2c3e50;
-                padding: 3px 5px;
-            }
-            QComboBox QAbstractItemView::item:hover {
-                color: #2c3e50;
-                background-color: #e8f4f8;
-            }
-        """)
+        self.resize_mode_combo.setObjectName("resizeModeCombo")
         self.resize_mode_combo.setEnabled(False)                     
         resize_mode_layout.addWidget(resize_mode_label)
         resize_mode_layout.addWidget(self.resize_mode_combo)
@@ -318,13 +379,7 @@ class ExportSettingsDialog(QDialog):
         # 缩放值设置
         resize_value_layout = QHBoxLayout()
         self.resize_value_label = QLabel("缩放比例:")
-        self.resize_value_label.setStyleSheet("""
-            QLabel {
-                font-family: "Microsoft YaHei UI", "Microsoft YaHei", sans-serif;
-                font-size: 12px;
-                color: #2c3e50;
-            }
-        """)
+        self.resize_value_label.setProperty("cls", "field")
         self.resize_value_spinbox = QSpinBox()
         self.resize_value_spinbox.setRange(10, 200)
         self.resize_value_spinbox.setValue(100)
@@ -337,15 +392,7 @@ class ExportSettingsDialog(QDialog):
         
         # 提示信息
         resize_hint = QLabel("💡 调整尺寸可减小文件大小，适合网络分享")
-        resize_hint.setStyleSheet("""
-            QLabel {
-                font-size: 12px;
-                color: #7f8c8d;
-                padding: 4px;
-                background-color: #ecf0f1;
-                border-radius: 3px;
-            }
-        """)
+        resize_hint.setProperty("cls", "hint")
         resize_hint.setWordWrap(True)
         layout.addWidget(resize_hint)
         
@@ -364,20 +411,7 @@ class ExportSettingsDialog(QDialog):
         self.output_path.setPlaceholderText("选择输出文件夹...")
         
         self.browse_button = QPushButton("浏览")
-        self.browse_button.setStyleSheet("""
-            QPushButton {
-                font-family: "Microsoft YaHei UI", "Microsoft YaHei", sans-serif;
-                background-color: #3498db;
-                color: white;
-                border: none;
-                padding: 8px 16px;
-                border-radius: 4px;
-                font-weight: bold;
-            }
-            QPushButton:hover {
-                background-color: #2980b9;
-            }
-        """)
+        self.browse_button.setObjectName("browseBtn")
         
         path_layout.addWidget(self.output_path)
         path_layout.addWidget(self.browse_button)
@@ -390,23 +424,8 @@ class ExportSettingsDialog(QDialog):
         # 覆盖选项
         self.overwrite_existing = QCheckBox("覆盖已存在的文件")
         
-        # 设置checkbox样式
-        checkbox_style = """
-            QCheckBox {
-                font-family: "Microsoft YaHei UI", "Microsoft YaHei", sans-serif;
-                font-size: 12px;
-                color: #2c3e50;
-                padding: 0px;
-                spacing: 8px;
-            }
-            QCheckBox::indicator {
-                width: 16px;
-                height: 16px;
-            }
-        """
-        
-        self.create_subfolder.setStyleSheet(checkbox_style)
-        self.overwrite_existing.setStyleSheet(checkbox_style)
+        self.create_subfolder.setProperty("cls", "option")
+        self.overwrite_existing.setProperty("cls", "option")
         
         layout.addWidget(self.create_subfolder)
         layout.addWidget(self.overwrite_existing)
@@ -428,23 +447,8 @@ class ExportSettingsDialog(QDialog):
         self.add_suffix = QRadioButton("添加后缀")
         self.custom_pattern = QRadioButton("自定义模式")
         
-        # 设置命名radio button样式
-        naming_radio_style = """
-            QRadioButton {
-                font-family: "Microsoft YaHei UI", "Microsoft YaHei", sans-serif;
-                font-size: 12px;
-                color: #2c3e50;
-                padding: 0px;
-                spacing: 8px;
-            }
-            QRadioButton::indicator {
-                width: 16px;
-                height: 16px;
-            }
-        """
-        
         for radio in [self.original_name, self.add_prefix, self.add_suffix, self.custom_pattern]:
-            radio.setStyleSheet(naming_radio_style)
+            radio.setProperty("cls", "option")
         
         self.naming_buttons.addButton(self.original_name, 0)
         self.naming_buttons.addButton(self.add_prefix, 1)
@@ -459,84 +463,39 @@ class ExportSettingsDialog(QDialog):
         layout.addWidget(self.add_suffix)
         layout.addWidget(self.custom_pattern)
         
-        # 输入框样式 - 统一字体和颜色
-        input_style = """
-            QLineEdit {
-                font-family: "Microsoft YaHei UI", "Microsoft YaHei", sans-serif;
-                font-size: 12px;
-                color: #2c3e50;
-                padding: 10px;
-                border: 1px solid #bdc3c7;
-                border-radius: 4px;
-                background-color: white;
-                min-height: 15px;
-            }
-            QLineEdit:disabled {
-                background-color: #f8f9fa;
-                color: #6c757d;
-                border-color: #dee2e6;
-            }
-            QLineEdit:focus {
-                border-color: #3498db;
-                border-width: 2px;
-            }
-            QLineEdit::placeholder {
-                color: #95a5a6;
-                font-style: italic;
-            }
-        """
-        
-        # 统一标签样式
-        label_style = """
-            QLabel {
-                font-family: "Microsoft YaHei UI", "Microsoft YaHei", sans-serif;
-                font-size: 12px;
-                color: #2c3e50;
-                min-width: 40px;
-            }
-        """
-        
         # 前缀/后缀输入
         prefix_layout = QHBoxLayout()
         prefix_label = QLabel("前缀:")
-        prefix_label.setStyleSheet(label_style)
+        prefix_label.setProperty("cls", "inputLabel")
         prefix_layout.addWidget(prefix_label)
         self.prefix_input = QLineEdit()
         self.prefix_input.setPlaceholderText("输入前缀...")
         self.prefix_input.setEnabled(False)
-        self.prefix_input.setStyleSheet(input_style)
+        self.prefix_input.setProperty("cls", "input")
         prefix_layout.addWidget(self.prefix_input)
         layout.addLayout(prefix_layout)
         
         suffix_layout = QHBoxLayout()
         suffix_label = QLabel("后缀:")
-        suffix_label.setStyleSheet(label_style)
+        suffix_label.setProperty("cls", "inputLabel")
         suffix_layout.addWidget(suffix_label)
         self.suffix_input = QLineEdit()
         self.suffix_input.setPlaceholderText("输入后缀...")
-        self.suffix_input.setStyleSheet(input_style)
+        self.suffix_input.setProperty("cls", "input")
         suffix_layout.addWidget(self.suffix_input)
         layout.addLayout(suffix_layout)
         
     
         # 自定义模式说明
         pattern_help = QLabel("模式说明: {name} - 原文件名, {date} - 日期, {time} - 时间, {index} - 序号")
-        pattern_help.setStyleSheet("""
-            QLabel {
-                font-size: 12px;
-                color: #7f8c8d;
-                padding: 4px;
-                background-color: #ecf0f1;
-                border-radius: 3px;
-            }
-        """)
+        pattern_help.setProperty("cls", "hint")
         pattern_help.setWordWrap(True)
         layout.addWidget(pattern_help)
         
         self.custom_input = QLineEdit()
         self.custom_input.setPlaceholderText("输入自定义模式...")
         self.custom_input.setEnabled(False)
-        self.custom_input.setStyleSheet(input_style)
+        self.custom_input.setProperty("cls", "input")
         layout.addWidget(self.custom_input)
         
         group.setLayout(layout)
@@ -566,39 +525,11 @@ class ExportSettingsDialog(QDialog):
         
         # 取消按钮
         self.cancel_button = QPushButton("取消")
-        self.cancel_button.setStyleSheet("""
-            QPushButton {
-                font-family: "Microsoft YaHei UI", "Microsoft YaHei", sans-serif;
-                background-color: #e74c3c;
-                color: white;
-                border: none;
-                padding: 10px 20px;
-                border-radius: 5px;
-                font-weight: bold;
-                min-width: 80px;
-            }
-            QPushButton:hover {
-                background-color: #c0392b;
-            }
-        """)
+        self.cancel_button.setObjectName("cancelBtn")
         
         # 开始导出按钮
         self.export_button = QPushButton("开始导出")
-        self.export_button.setStyleSheet("""
-            QPushButton {
-                font-family: "Microsoft YaHei UI", "Microsoft YaHei", sans-serif;
-                background-color: #27ae60;
-                color: white;
-                border: none;
-                padding: 10px 20px;
-                border-radius: 5px;
-                font-weight: bold;
-                min-width: 80px;
-            }
-            QPushButton:hover {
-                background-color: #229954;
-            }
-        """)
+        self.export_button.setObjectName("exportBtn")
         
         layout.addWidget(self.cancel_button)
         layout.addWidget(self.export_button)
@@ -610,16 +541,13 @@ class ExportSettingsDialog(QDialog):
         # 设置默认输出路径为桌面
         desktop_path = os.path.join(os.path.expanduser("~"), "Desktop")
         self.output_path.setText(desktop_path)
-        
-        # 更新预览
-        self.update_preview()
     
     def connect_signals(self):
         """连接信号"""
         # 按钮信号
         self.browse_button.clicked.connect(self.browse_output_folder)
         self.cancel_button.clicked.connect(self.reject)
-        self.export_button.clicked.connect(lambda: self.start_export())
+        self.export_button.clicked.connect(self.start_export)
         
         # 格式变化信号
         self.format_buttons.buttonClicked.connect(self.on_format_changed)
@@ -629,19 +557,19 @@ class ExportSettingsDialog(QDialog):
         self.naming_buttons.buttonClicked.connect(self.on_naming_changed)
         
         # 输入变化信号
-        self.prefix_input.textChanged.connect(lambda: self.update_preview())
-        self.suffix_input.textChanged.connect(lambda: self.update_preview())
-        self.custom_input.textChanged.connect(lambda: self.update_preview())
-        self.output_path.textChanged.connect(lambda: self.update_preview())
+        self.prefix_input.textChanged.connect(self.update_preview)
+        self.suffix_input.textChanged.connect(self.update_preview)
+        self.custom_input.textChanged.connect(self.update_preview)
+        self.output_path.textChanged.connect(self.update_preview)
         
         # 复选框信号
-        self.create_subfolder.toggled.connect(lambda: self.update_preview())
-        self.keep_original_format.toggled.connect(lambda: self.update_preview())
+        self.create_subfolder.toggled.connect(self.update_preview)
+        self.keep_original_format.toggled.connect(self.update_preview)
         
         # 缩放相关信号
         self.enable_resize.toggled.connect(self.on_resize_enabled_changed)
         self.resize_mode_combo.currentIndexChanged.connect(self.on_resize_mode_changed)
-        self.resize_value_spinbox.valueChanged.connect(lambda: self.update_preview())
+        self.resize_value_spinbox.valueChanged.connect(self.update_preview)
     
     @log_exception
     def browse_output_folder(self, checked=False):
@@ -692,37 +620,55 @@ class ExportSettingsDialog(QDialog):
     @log_exception
     def on_resize_mode_changed(self, index):
         """缩放模式变化处理"""
-        # 根据模式更新标签和范围
-        if index == 0:  # 按百分比
-            self.resize_value_label.setText("缩放比例:")
-            self.resize_value_spinbox.setRange(10, 200)
-            self.resize_value_spinbox.setValue(100)
-            self.resize_value_spinbox.setSuffix("%")
-        elif index == 1:  # 最长边
-            self.resize_value_label.setText("最长边:")
-            self.resize_value_spinbox.setRange(100, 8000)
-            self.resize_value_spinbox.setValue(1920)
-            self.resize_value_spinbox.setSuffix(" px")
-        elif index == 2:  # 宽度
-            self.resize_value_label.setText("宽度:")
-            self.resize_value_spinbox.setRange(100, 8000)
-            self.resize_value_spinbox.setValue(1920)
-            self.resize_value_spinbox.setSuffix(" px")
-        else:  # 高度
-            self.resize_value_label.setText("高度:")
-            self.resize_value_spinbox.setRange(100, 8000)
-            self.resize_value_spinbox.setValue(1080)
-            self.resize_value_spinbox.setSuffix(" px")
+        # 根据模式更新标签和范围；调整数值框时屏蔽其 valueChanged，最后只刷新一次预览
+        with QSignalBlocker(self.resize_value_spinbox):
+            if index == 0:  # 按百分比
+                self.resize_value_label.setText("缩放比例:")
+                self.resize_value_spinbox.setRange(10, 200)
+                self.resize_value_spinbox.setValue(100)
+                self.resize_value_spinbox.setSuffix("%")
+            elif index == 1:  # 最长边
+                self.resize_value_label.setText("最长边:")
+                self.resize_value_spinbox.setRange(100, 8000)
+                self.resize_value_spinbox.setValue(1920)
+                self.resize_value_spinbox.setSuffix(" px")
+            elif index == 2:  # 宽度
+                self.resize_value_label.setText("宽度:")
+                self.resize_value_spinbox.setRange(100, 8000)
+                self.resize_value_spinbox.setValue(1920)
+                self.resize_value_spinbox.setSuffix(" px")
+            else:  # 高度
+                self.resize_value_label.setText("高度:")
+                self.resize_value_spinbox.setRange(100, 8000)
+                self.resize_value_spinbox.setValue(1080)
+                self.resize_value_spinbox.setSuffix(" px")
         
         self.update_preview()
     
-    @log_exception
+    @pyqtSlot()
     def update_preview(self):
+        """请求更新预览（重新计时，在输入停止变化后由 _do_update_preview 统一刷新）"""
+        self._preview_timer.start()
+    
+    @log_exception
+    def _do_update_preview(self):
         """更新预览信息"""
+        # 预览面板尚未创建时无需更新，首次显示时会生成初始预览
+        if not self._preview_built:
+            return
+        
         try:
             # 获取当前配置
             config = self.get_export_config()
             
+            # 预览只取决于以下输入，与上次相同时无需重建文本
+            key = (config['format'], config.get('quality'), config.get('enable_resize'),
+                   config.get('resize_mode'), config.get('resize_value'), config['naming_mode'],
+                   config.get('prefix'), config.get('suffix'), config.get('custom_pattern'),
+                   config['output_dir'], config['create_subfolder'], config['keep_original_format'])
+            if key == self._last_preview_key:
+                return
+            
             # 生成预览文本
             preview_text = self.generate_preview_text(config)
             self.preview_info.setPlainText(preview_text)
@@ -730,90 +676,74 @@ class ExportSettingsDialog(QDialog):
             # 更新统计信息
             self.update_statistics(config)
             
+            self._last_preview_key = key
             logger.debug("导出预览已更新")
             
         except Exception as e:
+            self._last_preview_key = None
             logger.error(f"更新预览失败: {e}")
             self.preview_info.setPlainText(f"预览生成失败: {str(e)}")
     
     def generate_preview_text(self, config):
         """生成预览文本"""
-        lines = []
-        lines.append("=== 导出配置预览 ===")
-        lines.append("")
-        
         # 输出格式
         format_name = config['format'].upper()
         if config['format'] == 'jpeg':
             format_name += f" (质量: {config['quality']}%)"
-        lines.append(f"输出格式: {format_name}")
-        
-        if config['keep_original_format']:
-            lines.append("注意: 将保持原始格式，上述格式仅用于格式转换")
-        
-        lines.append("")
+        keep_note = "\n注意: 将保持原始格式，上述格式仅用于格式转换" if config['keep_original_format'] else ""
         
         # 尺寸设置
         if config.get('enable_resize', False):
             resize_mode = config.get('resize_mode', 0)
             resize_value = config.get('resize_value', 100)
             mode_names = ["按百分比", "最长边", "宽度", "高度"]
-            if resize_mode == 0:
-                lines.append(f"图片缩放: {mode_names[resize_mode]} - {resize_value}%")
-            else:
-                lines.append(f"图片缩放: {mode_names[resize_mode]} - {resize_value}px")
+            unit = "%" if resize_mode == 0 else "px"
+            resize_line = f"图片缩放: {mode_names[resize_mode]} - {resize_value}{unit}"
         else:
-            lines.append("图片缩放: 保持原始尺寸")
-        
-        lines.append("")
+            resize_line = "图片缩放: 保持原始尺寸"
         
         # 输出路径
         output_dir = config['output_dir']
         if config['create_subfolder']:
             output_dir = os.path.join(output_dir, "watermarked_images")
-        lines.append(f"输出目录: {output_dir}")
-        lines.append("")
         
         # 文件命名示例
-        lines.append("命名示例:")
-        sample_names = self.generate_sample_names(config)
-        for original, new in sample_names:
-            lines.append(f"  {original} → {new}")
-        
-        lines.append("")
-        lines.append(f"总计处理: {self.total_images} 个文件")
-        
-        return "\n".join(lines)
+        samples_block = "\n".join(f"  {original} → {new}" for original, new in self.generate_sample_names(config))
+        
+        return (f"=== 导出配置预览 ===\n\n"
+                f"输出格式: {format_name}{keep_note}\n\n"
+                f"{resize_line}\n\n"
+                f"输出目录: {output_dir}\n\n"
+                f"命名示例:\n{samples_block}\n\n"
+                f"总计处理: {self.total_images} 个文件")
     
     def generate_sample_names(self, config, count=3):
         """生成示例文件名"""
         samples = []
-        sample_originals = ["photo1.jpg", "IMG_001.png", "picture.bmp"]
+        naming_mode = config['naming_mode']
+        keep_ext = config['keep_original_format']
+        format_ext = f".{config['format']}"
         
-        for i, original in enumerate(sample_originals[:count]):
-            name, ext = os.path.splitext(original)
-            
+        for i, (name, ext) in enumerate(_SAMPLE_SPLITS[:count]):
             # 根据配置生成新文件名
-            if config['naming_mode'] == 'original':
+            if naming_mode == 'original':
                 new_name = name
-            elif config['naming_mode'] == 'prefix':
+            elif naming_mode == 'prefix':
                 new_name = config['prefix'] + name
-            elif config['naming_mode'] == 'suffix':
+            elif naming_mode == 'suffix':
                 new_name = name + config['suffix']
-            elif config['naming_mode'] == 'custom':
+            elif naming_mode == 'custom':
+                # 模式是用户正在输入的文本，可能含未闭合的花括号，因此逐个替换占位符而不用 format_map
                 pattern = config['custom_pattern']
                 new_name = pattern.replace('{name}', name)
-                new_name = new_name.replace('{index}', str(i+1).zfill(3))
+                new_name = new_name.replace('{index}', f"{i + 1:03d}")
                 new_name = new_name.replace('{date}', '20241002')
                 new_name = new_name.replace('{time}', '143022')
             
             # 确定输出扩展名
-            if config['keep_original_format']:
-                new_ext = ext
-            else:
-                new_ext = f".{config['format']}"
+            new_ext = ext if keep_ext else format_ext
             
-            samples.append((original, new_name + new_ext))
+            samples.append((name + ext, new_name + new_ext))
         
         return samples
     
@@ -851,6 +781,16 @@ class ExportSettingsDialog(QDialog):
         if config.get('create_subfolder', False):
             return [], False
         
+        # 在Windows上路径不区分大小写
+        is_windows = os.name == 'nt'
+        output_dir_cmp = output_dir.lower() if is_windows else output_dir
+        
+        # 先收集所有源目录：输出目录不是任何源目录时（如导出到桌面）不可能覆盖
+        source_dirs = {self._normalized_source(image_info.file_path)[0]
+                       for image_info in self.image_list if hasattr(image_info, 'file_path')}
+        if output_dir_cmp not in source_dirs:
+            return [], False
+        
         will_overwrite = []  # 存储会被覆盖的文件信息
         
         # 遍历所有图片，精确判断哪些会被覆盖
@@ -859,25 +799,19 @@ class ExportSettingsDialog(QDialog):
                 continue
             
             source_path = image_info.file_path
-            source_dir = os.path.normpath(os.path.dirname(source_path))
+            source_dir_cmp, source_path_cmp = self._normalized_source(source_path)
             
             # 只检查输出目录与源目录相同的文件
-            if source_dir != output_dir:
+            if source_dir_cmp != output_dir_cmp:
                 continue
             
             # 生成输出文件名（复制batch_export_engine的逻辑）
             output_filename = self._generate_output_filename(source_path, index, config)
             output_path = os.path.normpath(os.path.join(output_dir, output_filename))
-            source_path_norm = os.path.normpath(source_path)
             
             # 判断输出路径是否与源路径相同
-            # 在Windows上不区分大小写
-            if os.name == 'nt':  # Windows
-                paths_match = output_path.lower() == source_path_norm.lower()
-            else:  # Linux/Mac
-                paths_match = output_path == source_path_norm
-            
-            if paths_match:
+            output_path_cmp = output_path.lower() if is_windows else output_path
+            if output_path_cmp == source_path_cmp:
                 will_overwrite.append({
                     'source': os.path.basename(source_path),
                     'output': output_filename
@@ -886,6 +820,19 @@ class ExportSettingsDialog(QDialog):
         
         return will_overwrite, len(will_overwrite) > 0
     
+    def _normalized_source(self, source_path):
+        """返回用于比较的源目录和源路径（Windows上转为小写），结果按源路径缓存"""
+        cached = self._source_path_cache.get(source_path)
+        if cached is None:
+            source_dir = os.path.normpath(os.path.dirname(source_path))
+            source_path_norm = os.path.normpath(source_path)
+            if os.name == 'nt':
+                cached = (source_dir.lower(), source_path_norm.lower())
+            else:
+                cached = (source_dir, source_path_norm)
+            self._source_path_cache[source_path] = cached
+        return cached
+    
     def _generate_output_filename(self, input_path, index, config):
         """生成输出文件名（与batch_export_engine保持一致）"""
         original_name = os.path.splitext(os.path.basename(input_path))[0]
@@ -971,7 +918,7 @@ class ExportSettingsDialog(QDialog):
         }
     
     @log_exception
-    def start_export(self):
+    def start_export(self, checked=False):
         """开始导出"""
         config = self.get_export_config()
         
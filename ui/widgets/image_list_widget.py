@@ -381,8 +381,7 @@ class ImageListWidget(QWidget):
         """Refresh the image list"""
         self.list_widget.clear()
         
-        images = self.model.get_images()
-        for i, image_info in enumerate(images):
+        for i, image_info in enumerate(self.model.iter_images()):
             # Create list item
             item = QListWidgetItem()
             item.setSizeHint(QSize(0, 70))
@@ -407,7 +406,7 @@ class ImageListWidget(QWidget):
                 print(f"Error queueing thumbnail for {image_info.file_path}: {e}")
         
         # Update status
-        count = len(images)
+        count = self.model.count()
         if count == 0:
             self.status_label.setText("拖拽图片文件到此处")
         else:
@@ -449,12 +448,11 @@ class ImageListWidget(QWidget):
     @pyqtSlot()
     def update_selection(self):
         """Update selection visual feedback"""
-        images = self.model.get_images()
-        for i in range(self.list_widget.count()):
+        for i, image_info in zip(range(self.list_widget.count()), self.model.iter_images()):
             item = self.list_widget.item(i)
             widget = self.list_widget.itemWidget(item)
-            if isinstance(widget, ImageListItem) and i < len(images):
-                widget.set_selected(images[i].is_selected)
+            if isinstance(widget, ImageListItem):
+                widget.set_selected(image_info.is_selected)
     
     def on_checkbox_changed(self, index: int, state: int):
         """Handle checkbox state change"""
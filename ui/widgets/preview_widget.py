@@ -28,6 +28,15 @@ try:
 except ImportError:
     QFontDatabase = None
 
+# PyTurboJPEG 可选：可用时大JPEG预览通过libjpeg-turbo按比例直接解码
+try:
+    from turbojpeg import TurboJPEG, TJPF_RGB
+    _turbo_jpeg = TurboJPEG()
+    TURBOJPEG_AVAILABLE = True
+except Exception:  # 未安装模块或找不到libturbojpeg动态库
+    _turbo_jpeg = None
+    TURBOJPEG_AVAILABLE = False
+
 
 class PreviewGraphicsView(QGraphicsView):
     """Custom graphics view for image preview with zoom and pan"""
@@ -77,8 +86,9 @@ class PreviewGraphicsView(QGraphicsView):
         self.setMouseTracking(True)
         
         # 性能优化的缓存系统
-        self._original_cache = {}  # 原图缓存
+        self._original_cache = {}  # 原图缓存（大图片不缓存原图，值为None）
         self._preview_cache = {}   # 预览图缓存
+        self._original_size_cache = {}  # 原图尺寸缓存
         self._cache_max_size = 2   # 限制缓存大小
     
     @log_exception
@@ -103,20 +113,23 @@ class PreviewGraphicsView(QGraphicsView):
                 
                 # 智能预览策略决策
                 if total_pixels > self.PERFORMANCE_THRESHOLD:
-                    # 大图片：使用性能优化预览
-                    preview_img, scale_ratio = self._create_performance_preview(pil_img)
+                    # 大图片：使用性能优化预览（按预览尺寸解码，不完整解码原图）
+                    preview_img, scale_ratio = self._create_performance_preview(pil_img, image_path)
                     self.preview_scale_ratio = scale_ratio
                     self.preview_image_size = preview_img.size
                     logger.info(f"预览: 性能优化 - 预览尺寸 {preview_img.size[0]}x{preview_img.size[1]}, 缩放比例 {scale_ratio:.3f}")
+                    
+                    # 大图片只缓存预览图，水印位置按原图尺寸计算
+                    self._add_to_cache(image_path, None, preview_img.copy(), self.original_image_size)
                 else:
                     # 小图片：直接使用原图
                     preview_img = pil_img.copy()
                     self.preview_scale_ratio = 1.0
                     self.preview_image_size = self.original_image_size
                     logger.info(f"预览: 直接使用原图 无需优化")
-                
-                # 缓存原图和预览图
-                self._add_to_cache(image_path, pil_img.copy(), preview_img.copy())
+                    
+                    # 缓存原图和预览图
+                    self._add_to_cache(image_path, pil_img.copy(), preview_img.copy(), self.original_image_size)
             
             # 转换为QPixmap
             pixmap = self.pil_to_qpixmap(preview_img)
@@ -334,7 +347,8 @@ class PreviewGraphicsView(QGraphicsView):
         else:
             super().mouseReleaseEvent(event)
     
-    def _create_performance_preview(self, original_img: Image.Image) -> tuple[Image.Image, float]:
+    def _create_performance_preview(self, original_img: Image.Image,
+                                    image_path: Optional[str] = None) -> tuple[Image.Image, float]:
         """Create performance-optimized preview image"""
         original_pixels = original_img.size[0] * original_img.size[1]
         
@@ -348,32 +362,64 @@ class PreviewGraphicsView(QGraphicsView):
             int(original_img.size[1] * scale_ratio)
         )
         
+        # 优先使用libjpeg-turbo按比例解码JPEG
+        source_img = None
+        if image_path and original_img.format == 'JPEG' and TURBOJPEG_AVAILABLE:
+            source_img = self._decode_jpeg_scaled(image_path, scale_ratio)
+        
+        if source_img is None:
+            # 尚未解码的JPEG可由解码器直接按1/2、1/4、1/8比例解码；已加载的图片不受影响
+            original_img.draft(None, new_size)
+            source_img = original_img
+        
         # 高质量缩放
         try:
-            preview_img = original_img.resize(new_size, Image.Resampling.LANCZOS)
+            preview_img = source_img.resize(new_size, Image.Resampling.LANCZOS)
         except (MemoryError, OSError):
             # 如果内存不足，使用快速缩放
-            preview_img = original_img.resize(new_size, Image.Resampling.BILINEAR)
+            preview_img = source_img.resize(new_size, Image.Resampling.BILINEAR)
         
         return preview_img, scale_ratio
     
-    def _add_to_cache(self, image_path: str, original_img: Image.Image, preview_img: Image.Image):
+    def _decode_jpeg_scaled(self, image_path: str, scale_ratio: float) -> Optional[Image.Image]:
+        """Decode a JPEG with libjpeg-turbo at the smallest DCT scale not below scale_ratio"""
+        factors = [f for f in _turbo_jpeg.scaling_factors if f[0] / f[1] >= scale_ratio]
+        if not factors:
+            return None
+        scaling_factor = min(factors, key=lambda f: f[0] / f[1])
+        
+        try:
+            with open(image_path, 'rb') as f:
+                data = f.read()
+            arr = _turbo_jpeg.decode(data, pixel_format=TJPF_RGB, scaling_factor=scaling_factor)
+        except (OSError, ValueError) as e:
+            logger.debug(f"turbojpeg解码失败，回退到PIL: {e}")
+            return None
+        
+        logger.debug(f"预览: turbojpeg按 {scaling_factor[0]}/{scaling_factor[1]} 比例解码")
+        return Image.fromarray(arr, 'RGB')
+    
+    def _add_to_cache(self, image_path: str, original_img: Optional[Image.Image], preview_img: Image.Image,
+                      original_size: tuple):
         """Add images to cache with LRU eviction"""
         # 清理缓存
         if len(self._original_cache) >= self._cache_max_size:
             oldest_key = next(iter(self._original_cache))
             del self._original_cache[oldest_key]
             del self._preview_cache[oldest_key]
+            del self._original_size_cache[oldest_key]
             logger.debug(f"缓存已满，移除: {os.path.basename(oldest_key)}")
         
         self._original_cache[image_path] = original_img
         self._preview_cache[image_path] = preview_img
+        self._original_size_cache[image_path] = original_size
         logger.debug(f"缓存大小: {len(self._original_cache)}/{self._cache_max_size}")
     
     def clear_cache(self):
         """Clear image cache"""
         self._original_cache.clear()
         self._preview_cache.clear()
+        self._original_size_cache.clear()
         logger.debug("图片缓存已清空")
     
     def original_to_preview_coords(self, original_x: int, original_y: int) -> tuple[int, int]:
@@ -447,35 +493,45 @@ class PreviewGraphicsView(QGraphicsView):
                 # 使用预览图缓存（性能优化）
                 preview_img = self._preview_cache[image_path].copy()
                 original_img = self._original_cache[image_path]
-                logger.debug(f"预览: 使用缓存 - 预览图{preview_img.size}, 原图{original_img.size}")
+                original_size = self._original_size_cache[image_path]
+                logger.debug(f"预览: 使用缓存 - 预览图{preview_img.size}, 原图{original_size}")
             else:
                 logger.debug("预览: 从文件重新加载")
                 with Image.open(image_path) as img:
-                    original_img = img.copy()
-                    if original_img.mode not in ('RGB', 'RGBA'):
-                        original_img = original_img.convert('RGB')
+                    original_size = img.size
                     
-                    # 创建性能优化预览图
-                    preview_img, scale_ratio = self._create_performance_preview(original_img)
+                    if original_size[0] * original_size[1] > self.PERFORMANCE_THRESHOLD:
+                        # 大图片：按预览尺寸解码（JPEG draft），不完整解码原图，与 set_image 一致
+                        original_img = None
+                        preview_img, scale_ratio = self._create_performance_preview(img, image_path)
+                        if preview_img.mode not in ('RGB', 'RGBA'):
+                            preview_img = preview_img.convert('RGB')
+                    else:
+                        original_img = img.copy()
+                        if original_img.mode not in ('RGB', 'RGBA'):
+                            original_img = original_img.convert('RGB')
+                        
+                        # 创建性能优化预览图
+                        preview_img, scale_ratio = self._create_performance_preview(original_img)
                     self.preview_scale_ratio = scale_ratio
                     
                     # 更新尺寸信息
-                    self.original_image_size = original_img.size
+                    self.original_image_size = original_size
                     self.preview_image_size = preview_img.size
                     
                     # 缓存
-                    self._add_to_cache(image_path, original_img, preview_img)
+                    self._add_to_cache(image_path, original_img, preview_img, original_size)
             
             # 关键决策：水印渲染策略
-            total_pixels = self.original_image_size[0] * self.original_image_size[1]
+            total_pixels = original_size[0] * original_size[1]
             
-            if total_pixels > self.PERFORMANCE_THRESHOLD and self.preview_scale_ratio < 1.0:
+            if total_pixels > self.PERFORMANCE_THRESHOLD and (self.preview_scale_ratio < 1.0 or original_img is None):
                 # 大图片：在预览图上渲染，但使用原图坐标系统计算位置
                 logger.info(f"预览: 性能模式 - 在预览图({preview_img.size[0]}x{preview_img.size[1]})上渲染水印")
-                watermarked_img = self._apply_watermark_to_preview(preview_img, config, original_img.size)
+                watermarked_img = self._apply_watermark_to_preview(preview_img, config, original_size)
             else:
                 # 小图片：直接在原图上渲染
-                logger.info(f"预览: 质量模式 - 在原图({original_img.size[0]}x{original_img.size[1]})上渲染水印")
+                logger.info(f"预览: 质量模式 - 在原图({original_size[0]}x{original_size[1]})上渲染水印")
                 watermarked_img = self._apply_watermark_to_original(original_img, config)
             
             # Convert to QPixmap
@@ -932,35 +988,27 @@ class PreviewGraphicsView(QGraphicsView):
             logger.debug(f"Converting PIL image to QPixmap: {width}x{height}")
             
             # Convert image to appropriate format
-            # CRITICAL: Must keep reference to img_data to prevent garbage collection
+            # CRITICAL: Must keep reference to img_data until QPixmap.fromImage has run.
+            # QImage wraps the buffer without copying and QPixmap.fromImage makes the
+            # only copy, so no intermediate QImage.copy() is needed.
             logger.debug(f"Converting PIL image mode: {pil_image.mode}")
             if pil_image.mode == 'RGBA':
-                # For RGBA images, convert to Format_RGBA8888
-                logger.debug("Converting RGBA image to QImage")
                 img_data = pil_image.tobytes('raw', 'RGBA')
                 bytes_per_line = width * 4  # 4 bytes per pixel (RGBA)
-                qimg = QImage(img_data, width, height, bytes_per_line, QImage.Format_RGBA8888)
-                # Make a deep copy to avoid data corruption
-                qimg = qimg.copy()
-            elif pil_image.mode == 'RGB':
-                # For RGB images, ensure proper stride alignment
-                logger.debug("Converting RGB image to QImage")
-                img_data = pil_image.tobytes('raw', 'RGB')
-                bytes_per_line = width * 3  # 3 bytes per pixel (RGB)
-                logger.debug(f"Created RGB data: {len(img_data)} bytes, stride: {bytes_per_line}")
-                qimg = QImage(img_data, width, height, bytes_per_line, QImage.Format_RGB888)
-                # Make a deep copy to prevent data from being garbage collected
-                qimg = qimg.copy()
-                logger.debug("QImage created from RGB data with deep copy")
+                qimage_format = QImage.Format_RGBA8888
+            elif pil_image.mode == 'L':
+                img_data = pil_image.tobytes('raw', 'L')
+                bytes_per_line = width  # 1 byte per pixel
+                qimage_format = QImage.Format_Grayscale8
             else:
-                # Convert other formats to RGB first
-                logger.debug(f"Converting {pil_image.mode} to RGB for QPixmap")
-                rgb_img = pil_image.convert('RGB')
+                # RGB is used directly, other formats are converted to RGB first
+                rgb_img = pil_image if pil_image.mode == 'RGB' else pil_image.convert('RGB')
                 img_data = rgb_img.tobytes('raw', 'RGB')
-                bytes_per_line = width * 3
-                qimg = QImage(img_data, width, height, bytes_per_line, QImage.Format_RGB888)
-                # Make a deep copy
-                qimg = qimg.copy()
+                bytes_per_line = width * 3  # 3 bytes per pixel (RGB)
+                qimage_format = QImage.Format_RGB888
+            
+            logger.debug(f"Created image data: {len(img_data)} bytes, stride: {bytes_per_line}")
+            qimg = QImage(img_data, width, height, bytes_per_line, qimage_format)
             
             # Validate QImage before conversion
             logger.debug("Validating QImage")
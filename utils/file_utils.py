@@ -27,16 +27,21 @@ class FileUtils:
     @log_exception
     def is_image_file(cls, file_path: str) -> bool:
         """Check if file is a supported image format"""
-        logger.debug(f"检查文件格式: {os.path.basename(file_path)}")
+        logger.debug("检查文件格式: %s", os.path.basename(file_path))
         if not os.path.isfile(file_path):
-            logger.debug(f"文件不存在: {file_path}")
+            logger.debug("文件不存在: %s", file_path)
             return False
         
         ext = os.path.splitext(file_path.lower())[1]
         is_supported = ext in cls.SUPPORTED_EXTENSIONS
-        logger.debug(f"文件格式 {ext} 支持状态: {is_supported}")
+        logger.debug("文件格式 %s 支持状态: %s", ext, is_supported)
         return is_supported
     
+    @classmethod
+    def has_supported_extension(cls, file_name: str) -> bool:
+        """Check whether a file name has a supported image extension"""
+        return os.path.splitext(file_name.lower())[1] in cls.SUPPORTED_EXTENSIONS
+    
     @classmethod
     @log_exception
     def get_image_files_from_folder(cls, folder_path: str, recursive: bool = False, max_files: int = 10000) -> List[str]:
@@ -55,35 +60,40 @@ class FileUtils:
                     dirs[:] = [d for d in dirs if not d.startswith('.') and d.lower() not in ['$recycle.bin', 'system volume information']]
                     
                     for file in files:
+                        # Check the extension first so non-images cost no stat
+                        if not cls.has_supported_extension(file):
+                            continue
+                        
                         if len(image_files) >= max_files:
                             logger.warning(f"已达到最大文件限制 ({max_files}), 停止扫描")
                             break
                             
                         file_path = os.path.join(root, file)
                         try:
-                            if cls.is_image_file(file_path):
+                            if os.path.isfile(file_path):
                                 image_files.append(file_path)
-                                logger.debug(f"找到图片文件: {file_path}")
+                                logger.debug("找到图片文件: %s", file_path)
                         except (OSError, PermissionError) as e:
-                            logger.debug(f"无法访问文件 {file_path}: {e}")
+                            logger.debug("无法访问文件 %s: %s", file_path, e)
                             continue
                     
                     if len(image_files) >= max_files:
                         break
             else:
                 try:
-                    files = os.listdir(folder_path)
-                    for file in files:
-                        if len(image_files) >= max_files:
-                            break
+                    # DirEntry caches the file type from the directory listing,
+                    # so only symlinks need an extra stat
+                    with os.scandir(folder_path) as entries:
+                        for entry in entries:
+                            if len(image_files) >= max_files:
+                                break
                             
-                        file_path = os.path.join(folder_path, file)
-                        try:
-                            if cls.is_image_file(file_path):
-                                image_files.append(file_path)
-                        except (OSError, PermissionError):
-                            # Skip files that can't be accessed
-                            continue
+                            try:
+                                if cls.has_supported_extension(entry.name) and entry.is_file():
+                                    image_files.append(entry.path)
+                            except (OSError, PermissionError):
+                                # Skip files that can't be accessed
+                                continue
                 except PermissionError as e:
                     logger.error(f"无权访问文件夹: {folder_path} - {e}")
                     
@@ -2,17 +2,94 @@
 日志配置模块
 提供统一的日志记录功能
 """
+import atexit
 import logging
+import logging.handlers
 import os
+import queue
 import sys
+import threading
 from datetime import datetime
 
+# orjson 可选：可用时日志文件使用结构化JSON行格式
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
+
+
+class StructuredFormatter(logging.Formatter):
+    """结构化格式器：每条记录序列化为一行JSON（基于orjson）"""
+    
+    def format(self, record):
+        entry = {
+            'time': self.formatTime(record),
+            'name': record.name,
+            'level': record.levelname,
+            'func': record.funcName,
+            'line': record.lineno,
+            'msg': record.getMessage(),
+        }
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry['exc'] = record.exc_text
+        return orjson.dumps(entry).decode('utf-8')
+
+
+class BufferedFileHandler(logging.FileHandler):
+    """缓冲文件处理器：日志先写入内存缓冲区，定时或遇到错误时批量刷新到磁盘"""
+    
+    def __init__(self, filename, mode='a', encoding=None,
+                 capacity=64 * 1024, flush_interval=0.5, flush_level=logging.ERROR):
+        self.capacity = capacity
+        self.flush_interval = flush_interval
+        self.flush_level = flush_level
+        super().__init__(filename, mode, encoding)
+        
+        # 后台定时刷新线程
+        self._stop_event = threading.Event()
+        self._flush_thread = threading.Thread(
+            target=self._flush_loop, name='PhotoWatermarkLogFlush', daemon=True
+        )
+        self._flush_thread.start()
+    
+    def _open(self):
+        """以大缓冲区打开日志文件"""
+        return open(self.baseFilename, self.mode, encoding=self.encoding, buffering=self.capacity)
+    
+    def emit(self, record):
+        """写入缓冲区，不在每条记录后刷新"""
+        try:
+            if self.stream is None:
+                self.stream = self._open()
+            self.stream.write(self.format(record) + self.terminator)
+            if record.levelno >= self.flush_level:
+                self.stream.flush()
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+    
+    def _flush_loop(self):
+        """定时刷新缓冲区，直到处理器关闭"""
+        while not self._stop_event.wait(self.flush_interval):
+            self.flush()
+    
+    def close(self):
+        """停止刷新线程并写出剩余日志"""
+        self._stop_event.set()
+        super().close()
+
 
 class PhotoWatermarkLogger:
     """PhotoWatermark应用程序日志器"""
     
     def __init__(self):
         self.logger = None
+        self.listener = None
         self.setup_logger()
     
     def setup_logger(self):
@@ -29,12 +106,13 @@ class PhotoWatermarkLogger:
         self.logger = logging.getLogger('PhotoWatermark')
         self.logger.setLevel(logging.DEBUG)
         
-        # 清除已有的处理器
+        # 清除已有的处理器，并停止之前的后台监听线程
+        self.shutdown()
         if self.logger.handlers:
             self.logger.handlers.clear()
         
         # 创建文件处理器
-        file_handler = logging.FileHandler(log_file, encoding='utf-8')
+        file_handler = BufferedFileHandler(log_file, encoding='utf-8')
         file_handler.setLevel(logging.DEBUG)
         
         # 创建控制台处理器
@@ -42,9 +120,12 @@ class PhotoWatermarkLogger:
         console_handler.setLevel(logging.INFO)
         
         # 创建格式器
-        file_formatter = logging.Formatter(
-            '%(asctime)s - %(name)s - %(levelname)s - %(funcName)s:%(lineno)d - %(message)s'
-        )
+        if ORJSON_AVAILABLE:
+            file_formatter = StructuredFormatter()
+        else:
+            file_formatter = logging.Formatter(
+                '%(asctime)s - %(name)s - %(levelname)s - %(funcName)s:%(lineno)d - %(message)s'
+            )
         console_formatter = logging.Formatter(
             '[%(levelname)s] %(name)s: %(message)s'
         )
@@ -53,9 +134,13 @@ class PhotoWatermarkLogger:
         file_handler.setFormatter(file_formatter)
         console_handler.setFormatter(console_formatter)
         
-        # 添加处理器
-        self.logger.addHandler(file_handler)
-        self.logger.addHandler(console_handler)
+        # 通过队列将格式化与I/O交给后台线程，调用方只需入队
+        log_queue = queue.Queue(-1)
+        self.listener = logging.handlers.QueueListener(
+            log_queue, file_handler, console_handler, respect_handler_level=True
+        )
+        self.listener.start()
+        self.logger.addHandler(logging.handlers.QueueHandler(log_queue))
         
         # 记录启动信息
         self.logger.info("="*60)
@@ -66,11 +151,32 @@ class PhotoWatermarkLogger:
     def get_logger(self):
         """获取日志器实例"""
         return self.logger
+    
+    def flush(self):
+        """等待队列中的日志处理完毕，并将缓冲区写入磁盘"""
+        if self.listener is not None:
+            self.listener.queue.join()
+            for handler in self.listener.handlers:
+                handler.flush()
+    
+    def shutdown(self):
+        """停止后台监听线程，写出队列中剩余的日志"""
+        if self.listener is not None:
+            self.listener.stop()
+            for handler in self.listener.handlers:
+                handler.close()
+            self.listener = None
 
 
 # 全局日志器实例
 _photo_logger = PhotoWatermarkLogger()
 logger = _photo_logger.get_logger()
+atexit.register(_photo_logger.shutdown)
+
+
+def flush_logs():
+    """将已记录的日志全部写入日志文件"""
+    _photo_logger.flush()
 
 
 def log_exception(func):